@@ -8,10 +8,60 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "change-me-in-production")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./auditai.db")
+    DATABASE_READ_URL: str = os.getenv("DATABASE_READ_URL", "")   # read replica for report lists and fetches; empty = the primary
+    DB_READ_STICKY_S: float = float(os.getenv("DB_READ_STICKY_S", "5"))   # after a user writes, their reads use the primary this long
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))   # connections kept open per process
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))   # extra connections under load, closed when returned
+    DB_POOL_TIMEOUT_S: float = float(os.getenv("DB_POOL_TIMEOUT_S", "30"))   # wait for a free connection before failing
+    DB_POOL_RECYCLE_S: int = int(os.getenv("DB_POOL_RECYCLE_S", "1800"))   # reopen connections older than this; -1 = never
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"   # check a connection before handing it out
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "wal")   # wal | delete (SQLite's own default)
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "normal")   # normal is durable across app crashes in WAL mode; full = fsync every commit
+    SQLITE_MMAP_SIZE_MB: int = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))   # 0 = read through the page cache only
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))   # a blocked writer waits this long for the lock
+    DB_MIGRATE_ON_STARTUP: bool = os.getenv("DB_MIGRATE_ON_STARTUP", "false").lower() == "true"   # else startup only checks the schema revision
     ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")
+    ANTHROPIC_BASE_URL: str = os.getenv("ANTHROPIC_BASE_URL", "")   # empty = the real API; e.g. benchmarks/stub_anthropic.py
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))   # Claude calls in flight per process, and pooled connections
+    LLM_TIMEOUT_S: float = float(os.getenv("LLM_TIMEOUT_S", "60"))
+    LLM_CONNECT_TIMEOUT_S: float = float(os.getenv("LLM_CONNECT_TIMEOUT_S", "5"))
+    LLM_KEEPALIVE_S: float = float(os.getenv("LLM_KEEPALIVE_S", "30"))   # idle connections are kept this long
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_CACHE_TTL_S: int = int(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600)))   # 0 = don't cache analyses
+    LLM_CACHE_MEMORY_ENTRIES: int = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512"))
+    LLM_CACHE_DB_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_DB_MAX_ENTRIES", "20000"))
     STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "local")
     STORAGE_LOCAL_DIR: str = os.getenv("STORAGE_LOCAL_DIR", "./uploads")
+    COLUMNAR_COPY: bool = os.getenv("COLUMNAR_COPY", "true").lower() == "true"   # Parquet copies of uploads (pyarrow, in requirements.txt)
+    COLUMNAR_COMPRESSION: str = os.getenv("COLUMNAR_COMPRESSION", "zstd")
+    AWS_REGION: str = os.getenv("AWS_REGION", "us-east-1")
+    AWS_BUCKET: str = os.getenv("AWS_BUCKET", "")
+    AWS_ENDPOINT_URL: str = os.getenv("AWS_ENDPOINT_URL", "")   # R2 / Supabase / MinIO; empty = AWS
     TOXICITY_BACKEND: str = os.getenv("TOXICITY_BACKEND", "local")
+    TOXICITY_MODEL: str = os.getenv("TOXICITY_MODEL", "original")
+    TOXICITY_BATCH_SIZE: int = int(os.getenv("TOXICITY_BATCH_SIZE", "64"))
+    TOXICITY_NUM_THREADS: int = int(os.getenv("TOXICITY_NUM_THREADS", "0"))   # 0 = torch default
+    TOXICITY_WARMUP: bool = os.getenv("TOXICITY_WARMUP", "false").lower() == "true"
+    BIAS_AGE_BUCKETS: str = os.getenv("BIAS_AGE_BUCKETS", "18,25,35,45,55,65")   # edges for a numeric age column; empty = one group per age
+    PII_SCAN_BATCH_SIZE: int = int(os.getenv("PII_SCAN_BATCH_SIZE", "100000"))
+    INGEST_CSV_ENGINE: str = os.getenv("INGEST_CSV_ENGINE", "c")   # c | pyarrow (multithreaded, more memory; needs pyarrow)
+    INGEST_JSON_ENGINE: str = os.getenv("INGEST_JSON_ENGINE", "json")   # json | orjson (needs orjson)
+    SCORING_STREAM_THRESHOLD_MB: int = int(os.getenv("SCORING_STREAM_THRESHOLD_MB", "64"))   # 0 = always stream
+    SCORING_CHUNK_ROWS: int = int(os.getenv("SCORING_CHUNK_ROWS", "100000"))
+    SCORING_DRIFT_MAX_BLOCKS: int = int(os.getenv("SCORING_DRIFT_MAX_BLOCKS", "4096"))
+    SCORING_METRIC_THREADS: int = int(os.getenv("SCORING_METRIC_THREADS", "4"))   # 1 = metrics run one after another
+    SCORING_WORKERS: int = int(os.getenv("SCORING_WORKERS", "2"))   # 0 = thread in the server process
+    SCORING_MAX_QUEUE: int = int(os.getenv("SCORING_MAX_QUEUE", "16"))
+    SCORING_JOB_TIMEOUT_S: int = int(os.getenv("SCORING_JOB_TIMEOUT_S", "300"))
+    REPORT_COMPRESSION: str = os.getenv("REPORT_COMPRESSION", "zlib")   # zlib | zstd (needs zstandard) for stored full reports
+    REPORT_LIST_PAGE_SIZE: int = int(os.getenv("REPORT_LIST_PAGE_SIZE", "50"))   # GET /reports/ page size when no limit is given
+    REPORT_LIST_MAX_PAGE_SIZE: int = int(os.getenv("REPORT_LIST_MAX_PAGE_SIZE", "200"))
+    REPORT_BATCH_MAX_ITEMS: int = int(os.getenv("REPORT_BATCH_MAX_ITEMS", "250"))   # requests per POST /reports/generate-batch
+    REPORT_JOB_WORKERS: int = int(os.getenv("REPORT_JOB_WORKERS", "4"))   # report jobs run at once per server process
+    REPORT_JOB_TIMEOUT_S: int = int(os.getenv("REPORT_JOB_TIMEOUT_S", "900"))
+    REPORT_JOB_MAX_ATTEMPTS: int = int(os.getenv("REPORT_JOB_MAX_ATTEMPTS", "3"))   # runs before an interrupted job is failed
+    REPORT_JOB_SWEEP_S: int = int(os.getenv("REPORT_JOB_SWEEP_S", "30"))   # how often left-over jobs are picked up from the DB
+    REPORT_JOB_RETENTION_H: int = int(os.getenv("REPORT_JOB_RETENTION_H", "72"))   # finished jobs kept this long; 0 = forever
 
     class Config:
         env_file = ".env"
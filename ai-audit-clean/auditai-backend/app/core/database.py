@@ -1,24 +1,118 @@
+import logging
 import os
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./auditai.db")
+from app.core.config import settings
 
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+def _async_url(url: str) -> str:
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    return url
+
+
+DATABASE_URL      = _async_url(os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./auditai.db"))
+DATABASE_READ_URL = _async_url(os.getenv("DATABASE_READ_URL", ""))   # read replica; empty = read from the primary
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+
+logger = logging.getLogger(__name__)
+
+
+def make_engine(url: str) -> AsyncEngine:
+    """
+    An engine with the DB_* pool settings. SQLite connections also get the
+    SQLITE_* pragmas when they open: WAL lets readers run alongside the one
+    writer, and busy_timeout makes a blocked writer wait instead of failing
+    with "database is locked".
+    """
+    sqlite  = url.startswith("sqlite")
+    options = {
+        "pool_size":     settings.DB_POOL_SIZE,
+        "max_overflow":  settings.DB_MAX_OVERFLOW,
+        "pool_timeout":  settings.DB_POOL_TIMEOUT_S,
+        "pool_recycle":  settings.DB_POOL_RECYCLE_S,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if sqlite:
+        if ":memory:" in url or url.rstrip("/").endswith(":"):
+            options = {}   # one static connection; a pool would hand out empty databases
+        else:
+            # aiosqlite defaults to opening a connection per checkout, which drops
+            # the page cache and mmap each time; keep them open like any other backend
+            options["poolclass"] = AsyncAdaptedQueuePool
+    new_engine = create_async_engine(url, echo=False, **options)
+    if sqlite:
+        event.listen(new_engine.sync_engine, "connect", _sqlite_pragmas)
+    return new_engine
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024}")
+    cursor.close()
+
+
+engine = make_engine(DATABASE_URL)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+read_engine = make_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False)   # see app/core/read_routing.py
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class SchemaOutOfDate(RuntimeError):
+    """The database isn't at the migration revision this code was written against."""
+
+
 async def init_db():
-    from app.models import orm  # noqa
+    """
+    Check the database schema at startup. Migrations run in the release step
+    (`alembic upgrade head`, see the Procfile); here we only compare the
+    database's revision with the newest migration and refuse to start when
+    they differ. With DB_MIGRATE_ON_STARTUP=true (local development, single
+    instances) the upgrade runs here instead.
+    """
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(ALEMBIC_INI)
+    head = ScriptDirectory.from_config(config).get_current_head()
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        if settings.DB_MIGRATE_ON_STARTUP:
+            await conn.run_sync(_upgrade, config)
+        current = await conn.run_sync(_current_revision)
+    if current != head:
+        raise SchemaOutOfDate(
+            f"Database schema is at revision {current or 'none'}, this code needs {head}: "
+            f"run `alembic upgrade head`"
+        )
+    logger.info(f"Database schema at revision {current}")
+
+    if read_engine is not engine:
+        async with read_engine.connect() as conn:
+            replica = await conn.run_sync(_current_revision)
+        if replica != head:   # usually replication lag right after a release; it catches up on its own
+            logger.warning(f"Read replica schema is at revision {replica or 'none'}, this code needs {head}")
+
+
+def _current_revision(conn):
+    from alembic.runtime.migration import MigrationContext
+    return MigrationContext.configure(conn).get_current_revision()
+
+
+def _upgrade(conn, config) -> None:
+    from alembic import command
+    config.attributes["connection"] = conn   # migrations/env.py runs on this connection
+    command.upgrade(config, "head")
 
 
 async def get_db():
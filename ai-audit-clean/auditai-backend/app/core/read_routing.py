@@ -0,0 +1,175 @@
+"""
+read_routing.py — sends report reads to the read replica, keeping
+read-your-writes.
+
+With DATABASE_READ_URL set, endpoints that take their session from
+get_read_db read from the replica, except a user who has just written
+reads from the primary, so they see their own changes even while the
+replica lags:
+  - in this process: a commit that wrote rows for a user (in one of their
+    requests, or a report job of theirs) sends that user's reads to the
+    primary for DB_READ_STICKY_S
+  - across processes: the response to a write carries X-Primary-Until; a
+    client that sends it back reads from the primary until then. For a
+    streamed response the window starts when the stream does.
+A report that isn't on the replica yet is looked up again on the primary
+(see primary_on_miss). Without DATABASE_READ_URL every read session
+is a primary session and none of this runs.
+"""
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional
+from fastapi import Depends, Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, ReadSessionLocal, engine, read_engine
+from app.core.security import decode_token, get_current_user
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+SAFE_METHODS         = {"GET", "HEAD", "OPTIONS"}
+PRUNE_AT             = 10_000   # sticky users kept before expired entries are swept
+
+acting_user: ContextVar[Optional[str]] = ContextVar("acting_user", default=None)
+_primary_until: dict[str, float] = {}   # user id → epoch seconds their reads go to the primary until
+_counts = {"replica": 0, "primary": 0, "primary_on_miss": 0}
+
+
+def replica_enabled() -> bool:
+    return read_engine is not engine
+
+
+@contextmanager
+def acting_for(user_id: str) -> Iterator[None]:
+    """Attribute commits made inside the block to user_id."""
+    token = acting_user.set(user_id)
+    try:
+        yield
+    finally:
+        acting_user.reset(token)
+
+
+def note_write(user_id: str) -> float:
+    """Send user_id's reads to the primary for DB_READ_STICKY_S; returns until when."""
+    until = time.time() + settings.DB_READ_STICKY_S
+    if len(_primary_until) >= PRUNE_AT:
+        now = time.time()
+        for stale in [u for u, t in _primary_until.items() if t <= now]:
+            del _primary_until[stale]
+    _primary_until[user_id] = until
+    return until
+
+
+def reads_from_primary(user_id: str, primary_until: Optional[str] = None) -> bool:
+    """Whether user_id wrote recently, here or (per the client's X-Primary-Until) elsewhere."""
+    now = time.time()
+    if _primary_until.get(user_id, 0) > now:
+        return True
+    try:
+        # Capped, so a made-up header can't pin a client to the primary
+        return now < float(primary_until or 0) <= now + settings.DB_READ_STICKY_S
+    except ValueError:
+        return False
+
+
+def is_replica(db: AsyncSession) -> bool:
+    return replica_enabled() and db.bind is read_engine
+
+
+async def get_read_db(
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+) -> AsyncIterator[AsyncSession]:
+    """A session for reads: on the replica, or the primary if the user wrote recently."""
+    primary = not replica_enabled() or reads_from_primary(
+        current_user["id"], request.headers.get(PRIMARY_UNTIL_HEADER)
+    )
+    _counts["primary" if primary else "replica"] += 1
+    async with (AsyncSessionLocal if primary else ReadSessionLocal)() as session:
+        yield session
+
+
+@asynccontextmanager
+async def primary_on_miss() -> AsyncIterator[AsyncSession]:
+    """A primary session, to retry a read that found nothing on the replica."""
+    _counts["primary_on_miss"] += 1
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+def read_routing_stats() -> dict:
+    return {
+        "enabled":      replica_enabled(),
+        "sticky_users": sum(1 for until in _primary_until.values() if until > time.time()),
+        **_counts,
+    }
+
+
+# ── Write tracking ────────────────────────────────────────────────────────────
+
+def _after_flush(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+def _after_commit(session: Session) -> None:
+    user_id = acting_user.get()
+    if session.info.pop("wrote", False) and user_id:
+        note_write(user_id)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop("wrote", None)
+
+
+if replica_enabled():
+    logger.info(f"Report reads go to the read replica, sticky to the primary for {settings.DB_READ_STICKY_S:g}s after a write")
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Runs each authenticated request as its user (see acting_for) and stamps
+    X-Primary-Until on successful responses to their writes. Plain ASGI, so
+    it doesn't buffer or detach streamed responses.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        user_id = _user_from(scope) if scope["type"] == "http" else None
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        write = scope["method"] not in SAFE_METHODS
+
+        async def send_stamped(message):
+            if write and message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message)[PRIMARY_UNTIL_HEADER] = f"{note_write(user_id):.3f}"
+            await send(message)
+
+        with acting_for(user_id):
+            await self.app(scope, receive, send_stamped)
+
+
+def _user_from(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            try:
+                return decode_token(token).get("sub")
+            except Exception:
+                return None   # the endpoint's own get_current_user turns it away
+    return None
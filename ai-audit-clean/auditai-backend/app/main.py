@@ -1,15 +1,32 @@
 import os
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.routers import reports, upload, auth
+from app.core.config import settings
 from app.core.database import init_db
+from app.core.read_routing import PRIMARY_UNTIL_HEADER, ReadYourWritesMiddleware, read_routing_stats, replica_enabled
+from app.services.claude_service import close_client, get_client, llm_stats
+from app.services.executor import get_scoring_executor
+from app.services.report_jobs import get_report_job_runner
+from app.services.toxicity import warm_toxicity_model
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    executor = get_scoring_executor()
+    executor.start()
+    if settings.TOXICITY_WARMUP and executor.workers <= 0:
+        await asyncio.to_thread(warm_toxicity_model)   # workers warm their own copy
+    get_client()
+    jobs = get_report_job_runner()
+    jobs.start()
     yield
+    await jobs.shutdown()
+    await close_client()
+    executor.shutdown()
 
 
 app = FastAPI(title="AuditAI Backend", version="1.0.0", lifespan=lifespan)
@@ -22,7 +39,10 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", PRIMARY_UNTIL_HEADER],   # GET /reports/ pagination; read-your-writes
 )
+if replica_enabled():
+    app.add_middleware(ReadYourWritesMiddleware)
 
 app.include_router(auth.router,    prefix="/auth",    tags=["Auth"])
 app.include_router(upload.router,  prefix="/upload",  tags=["Upload"])
@@ -31,4 +51,11 @@ app.include_router(reports.router, prefix="/reports", tags=["Reports"])
 
 @app.get("/health")
 def health():
-    return {"status": "ok", "service": "AuditAI Backend v1.0"}
+    return {
+        "status":      "ok",
+        "service":     "AuditAI Backend v1.0",
+        "scoring":     get_scoring_executor().stats(),
+        "report_jobs": get_report_job_runner().stats(),
+        "llm":         llm_stats(),
+        "db_reads":    read_routing_stats(),
+    }
@@ -1,8 +1,10 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Float, Integer, Boolean, DateTime, JSON, ForeignKey
+from typing import Optional
+from sqlalchemy import String, Float, Integer, Boolean, DateTime, JSON, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
+from app.models.types import CompressedJSON
 
 
 def new_uuid() -> str:
@@ -22,15 +24,42 @@ class User(Base):
     uploads:          Mapped[list["Upload"]] = relationship("Upload", back_populates="user")
 
 
+class Blob(Base):
+    """One stored copy of an uploaded file's content, shared by every upload of it, with its cached scores."""
+    __tablename__ = "blobs"
+    __table_args__ = (UniqueConstraint("content_hash", "ext"),)
+    id:             Mapped[str]      = mapped_column(String, primary_key=True, default=new_uuid)
+    content_hash:   Mapped[str]      = mapped_column(String, nullable=False)   # SHA-256 of the file bytes
+    ext:            Mapped[str]      = mapped_column(String, nullable=False)   # csv / json — decides how it parses
+    storage_path:   Mapped[str]      = mapped_column(String, nullable=False)
+    columnar_path:  Mapped[str]      = mapped_column(String, nullable=True)    # Parquet copy, when written
+    size_bytes:     Mapped[int]      = mapped_column(Integer, default=0)
+    row_count:      Mapped[int]      = mapped_column(Integer, default=0)
+    columns:        Mapped[list]     = mapped_column(JSON, nullable=True)
+    scores:         Mapped[dict]     = mapped_column(JSON, nullable=True)
+    column_map:     Mapped[dict]     = mapped_column(JSON, nullable=True)
+    engine_version: Mapped[str]      = mapped_column(String, nullable=True)
+    created_at:     Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    uploads:        Mapped[list["Upload"]] = relationship("Upload", back_populates="blob")
+
+
 class Upload(Base):
     __tablename__ = "uploads"
     id:           Mapped[str]      = mapped_column(String, primary_key=True, default=new_uuid)
     user_id:      Mapped[str]      = mapped_column(String, ForeignKey("users.id"), nullable=False)
+    blob_id:      Mapped[str]      = mapped_column(String, ForeignKey("blobs.id"), nullable=True)
     filename:     Mapped[str]      = mapped_column(String, nullable=False)
     storage_path: Mapped[str]      = mapped_column(String, nullable=False)
     row_count:    Mapped[int]      = mapped_column(Integer, default=0)
+    scores:       Mapped[dict]     = mapped_column(JSON, nullable=True)     # metric → score, as computed at upload
+    column_map:   Mapped[dict]     = mapped_column(JSON, nullable=True)     # input → column it was read from
+    engine_version: Mapped[str]    = mapped_column(String, nullable=True)   # SCORING_ENGINE_VERSION of scores
     created_at:   Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     user:         Mapped["User"]   = relationship("User", back_populates="uploads")
+    blob:         Mapped["Blob"]   = relationship("Blob", back_populates="uploads")
+
+
+Index("ix_uploads_user_id_created_at", Upload.user_id, Upload.created_at.desc())
 
 
 class Report(Base):
@@ -52,7 +81,68 @@ class Report(Base):
     drift_score:          Mapped[float]    = mapped_column(Float, nullable=True)
     overall_risk:         Mapped[str]      = mapped_column(String, nullable=True)
     readiness_pct:        Mapped[int]      = mapped_column(Integer, nullable=True)
-    full_report:          Mapped[dict]     = mapped_column(JSON, nullable=True)
     pdf_path:             Mapped[str]      = mapped_column(String, nullable=True)
     created_at:           Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     user:                 Mapped["User"]   = relationship("User", back_populates="reports")
+    content:              Mapped["ReportContent"] = relationship(
+        "ReportContent", uselist=False, cascade="all, delete-orphan", back_populates="report",
+    )
+
+    @property
+    def full_report(self) -> Optional[dict]:
+        """The build_report output. Queries that read it must eager-load `content`; async sessions can't lazy-load."""
+        return self.content.full_report if self.content is not None else None
+
+    @full_report.setter
+    def full_report(self, value: Optional[dict]) -> None:
+        if self.content is None:
+            self.content = ReportContent(full_report=value)
+        else:
+            self.content.full_report = value
+
+
+class ReportContent(Base):
+    """A report's full build_report output, compressed, kept apart so report rows stay small."""
+    __tablename__ = "report_contents"
+    report_id:   Mapped[str]      = mapped_column(String, ForeignKey("reports.id", ondelete="CASCADE"), primary_key=True)
+    full_report: Mapped[dict]     = mapped_column(CompressedJSON, nullable=False)
+    report:      Mapped["Report"] = relationship("Report", back_populates="content")
+
+
+Index("ix_reports_user_id_created_at_id", Report.user_id, Report.created_at.desc(), Report.id.desc())
+
+
+class ReportJob(Base):
+    """A report requested with POST /reports/generate?mode=job, and how far it has got."""
+    __tablename__ = "report_jobs"
+    id:           Mapped[str]      = mapped_column(String, primary_key=True, default=new_uuid)
+    user_id:      Mapped[str]      = mapped_column(String, ForeignKey("users.id"), nullable=False)
+    request:      Mapped[dict]     = mapped_column(JSON, nullable=False)      # the ReportRequest as submitted
+    status:       Mapped[str]      = mapped_column(String, default="queued")  # queued → running → succeeded | failed
+    stage:        Mapped[str]      = mapped_column(String, nullable=True)     # pipeline step while running
+    report_id:    Mapped[str]      = mapped_column(String, ForeignKey("reports.id", ondelete="SET NULL"), nullable=True)
+    error:        Mapped[str]      = mapped_column(String, nullable=True)
+    attempts:     Mapped[int]      = mapped_column(Integer, default=0)        # runs started, including interrupted ones
+    created_at:   Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at:   Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)   # refreshed while a worker runs it
+    finished_at:  Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+
+Index("ix_report_jobs_status_created_at", ReportJob.status, ReportJob.created_at)
+
+
+class LLMCacheEntry(Base):
+    """A Claude analysis, stored under the hash of the model and prompt that produced it."""
+    __tablename__ = "llm_cache"
+    key:         Mapped[str]      = mapped_column(String, primary_key=True)   # SHA-256 of model + normalised prompt
+    model:       Mapped[str]      = mapped_column(String, nullable=False)
+    result:      Mapped[dict]     = mapped_column(JSON, nullable=False)
+    hits:        Mapped[int]      = mapped_column(Integer, default=0)
+    created_at:  Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at:  Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_hit_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+
+Index("ix_llm_cache_expires_at", LLMCacheEntry.expires_at)
+Index("ix_llm_cache_created_at", LLMCacheEntry.created_at)
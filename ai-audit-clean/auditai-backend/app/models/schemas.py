@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, Any
+from typing import Optional, Any, List
 from datetime import datetime
 
 
@@ -74,3 +74,32 @@ class ReportListItem(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class BatchReportItem(BaseModel):
+    index: int                               # position in the request list
+    status: str                              # "ok" | "error"
+    status_code: int                         # what /generate would have answered
+    report: Optional[ReportListItem] = None
+    error: Optional[str] = None
+
+
+class BatchReportResponse(BaseModel):
+    succeeded: int
+    failed: int
+    items: List[BatchReportItem]
+
+
+class ReportJobResponse(BaseModel):
+    id: str
+    status: str
+    stage: Optional[str]
+    report_id: Optional[str]
+    error: Optional[str]
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
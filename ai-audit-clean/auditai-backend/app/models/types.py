@@ -0,0 +1,59 @@
+"""
+types.py — custom column types.
+
+CompressedJSON stores a JSON document as compressed bytes. The first byte
+names the codec, so rows written with one REPORT_COMPRESSION setting still
+read after it changes:
+  0x01  zlib (standard library)
+  0x02  zstd (needs the zstandard package; zlib is used when it's missing)
+"""
+import json
+import zlib
+from typing import Any, Optional
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from app.core.config import settings
+
+ZLIB = b"\x01"
+ZSTD = b"\x02"
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def compress_json(value: Any) -> bytes:
+    data = json.dumps(value, separators=(",", ":")).encode()
+    if settings.REPORT_COMPRESSION == "zstd" and zstd_available():
+        import zstandard
+        return ZSTD + zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return ZLIB + zlib.compress(data, ZLIB_LEVEL)
+
+
+def decompress_json(blob: bytes) -> Any:
+    codec, payload = blob[:1], blob[1:]
+    if codec == ZLIB:
+        return json.loads(zlib.decompress(payload))
+    if codec == ZSTD:
+        import zstandard
+        return json.loads(zstandard.ZstdDecompressor().decompress(payload))
+    raise ValueError(f"Unknown compression codec {codec!r}")
+
+
+class CompressedJSON(TypeDecorator):
+    """A JSON document, stored compressed in a binary column."""
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        return None if value is None else compress_json(value)
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Any:
+        return None if value is None else decompress_json(bytes(value))
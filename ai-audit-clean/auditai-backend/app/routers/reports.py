@@ -1,26 +1,45 @@
 """
-/reports — generate, list, retrieve, and delete audit reports.
+/reports — generate, list, retrieve, and delete audit reports, and follow report jobs.
 """
+import base64
+import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import or_, select
+from sqlalchemy.orm import joinedload
+from typing import List, Literal, Optional, Union
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.read_routing import get_read_db, is_replica, primary_on_miss
 from app.core.security import get_current_user
-from app.models.orm import Report, Upload
-from app.models.schemas import ReportRequest, ReportResponse, ReportListItem, RiskMetrics
-from app.services.claude_service import generate_ai_analysis
-from app.services.report_builder import build_report, risk_level
+from app.models.orm import Report, ReportJob
+from app.models.schemas import (
+    BatchReportItem, BatchReportResponse, ReportRequest, ReportResponse, ReportJobResponse, ReportListItem, RiskMetrics,
+)
+from app.services.executor import ScoringQueueFull, ScoringTimeout, ScoringUnavailable
+from app.services.report_jobs import get_report_job_runner
+from app.services.report_service import (
+    RescoreFailed, UploadNotFound, prepare_report, prepare_reports, stream_report,
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+GENERATION_ERRORS = (UploadNotFound, ScoringQueueFull, ScoringUnavailable, ScoringTimeout, RescoreFailed)
+SSE_HEADERS       = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}   # no proxy buffering
+LIST_COLUMNS      = (Report.id, Report.model_name, Report.org_name, Report.overall_risk,
+                     Report.readiness_pct, Report.created_at)   # what ReportListItem needs, and no full_report
 
-@router.post("/generate", response_model=ReportResponse)
+
+@router.post("/generate", response_model=Union[ReportResponse, ReportJobResponse])
 async def generate_report(
     body: ReportRequest,
+    response: Response,
+    mode: Literal["sync", "job"] = "sync",
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
@@ -29,131 +48,180 @@ async def generate_report(
     - If upload_id provided: uses real computed scores from uploaded file
     - If manual scores provided: uses those directly
     - Always calls Claude API for AI analysis
+    - mode=job: returns a queued job (202) straight away instead of the report;
+      follow it with GET /reports/jobs/{id} or /reports/jobs/{id}/events
     """
-    scores = {}
-
-    # ── Get scores from upload or manual input ────────────────────────────────
-    row_count = 0
+    if mode == "job":
+        job = await get_report_job_runner().submit(db, current_user["id"], body)
+        response.status_code = 202
+        return ReportJobResponse.model_validate(job)
 
-    if body.upload_id:
-        # Load scores from a previous upload
-        result = await db.execute(
-            select(Upload).where(Upload.id == body.upload_id, Upload.user_id == current_user["id"])
-        )
-        upload = result.scalar_one_or_none()
-        if not upload:
-            raise HTTPException(status_code=404, detail="Upload not found")
-
-        # Re-run scoring from stored file
-        import pandas as pd
-        from app.services.scoring import compute_all_scores
-        from app.services.storage import load_file_path
-
-        try:
-            file_path = load_file_path(upload.storage_path)
-            ext = upload.filename.lower().split(".")[-1]
-            df = pd.read_csv(file_path) if ext == "csv" else pd.read_json(file_path)
-            scores = compute_all_scores(df)
-            row_count = len(df)
-        except Exception as e:
-            logger.error(f"Failed to re-score from file: {e}")
-            raise HTTPException(status_code=500, detail=f"Failed to process uploaded file: {str(e)}")
-
-    else:
-        # Use manually provided scores
-        scores = {
-            "bias":           body.bias_score          or 0.3,
-            "hallucination":  body.hallucination_score or 0.3,
-            "toxicity":       body.toxicity_score      or 0.1,
-            "robustness":     body.robustness_score    or 0.3,
-            "explainability": body.explainability_score or 0.4,
-            "data_leakage":   body.data_leakage_score  or 0.2,
-            "drift":          body.drift_score         or 0.25,
-        }
-
-    # ── Claude AI analysis ────────────────────────────────────────────────────
-    system_info = {
-        "model_name":      body.model_name,
-        "model_version":   body.model_version,
-        "org_name":        body.org_name,
-        "use_case":        body.use_case,
-        "deploy_env":      body.deploy_env,
-        "training_data":   body.training_data,
-        "oversight_policy": body.oversight_policy,
-        "incident_policy": body.incident_policy,
-        "framework":       body.framework,
-    }
-
-    ai_analysis = await generate_ai_analysis(scores, system_info)
-
-    # ── Build full report ─────────────────────────────────────────────────────
-    full_report = build_report(scores, system_info, ai_analysis, row_count)
-
-    avg_score   = sum(scores.values()) / len(scores)
-    overall     = risk_level(avg_score)
-    readiness   = round((1 - avg_score) * 100)
+    try:
+        report = await prepare_report(db, current_user["id"], body)
+    except GENERATION_ERRORS as e:
+        raise _generation_error(e)
 
     # ── Save to database ──────────────────────────────────────────────────────
-    report = Report(
-        user_id=current_user["id"],
-        model_name=body.model_name,
-        model_version=body.model_version,
-        org_name=body.org_name,
-        use_case=body.use_case,
-        deploy_env=body.deploy_env,
-        framework=body.framework,
-        bias_score=scores["bias"],
-        hallucination_score=scores["hallucination"],
-        toxicity_score=scores["toxicity"],
-        robustness_score=scores["robustness"],
-        explainability_score=scores["explainability"],
-        data_leakage_score=scores["data_leakage"],
-        drift_score=scores["drift"],
-        overall_risk=overall,
-        readiness_pct=readiness,
-        full_report=full_report,
-    )
     db.add(report)
-    await db.commit()
-    await db.refresh(report)
+    await db.commit()   # ids and timestamps are set at flush; nothing to refresh
 
     return _to_response(report)
 
 
+@router.post("/generate/stream")
+async def generate_report_stream(
+    body: ReportRequest,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Generate a report like /generate, sent as server-sent events while it is
+    built:
+      scores          the scores and row count, as soon as they are known
+      report          the rule-based report sections (ai_analysis is null)
+      analysis_delta  Claude's answer text as it arrives
+      analysis        the final analysis, which replaces the streamed text
+      done            the saved report, as /generate returns it
+    A failure ends the stream with an `error` event carrying the status code
+    and detail that /generate would have answered with.
+    """
+    user_id = current_user["id"]
+
+    async def events():
+        # A session of its own: the request's is closed before the stream is sent
+        async with AsyncSessionLocal() as db:
+            try:
+                async for event, data in stream_report(db, user_id, body):
+                    if event != "built":
+                        yield _sse(event, data)
+                        continue
+                    db.add(data)
+                    await db.commit()
+                    yield _sse("done", _to_response(data).model_dump(mode="json"))
+            except Exception as e:
+                if not isinstance(e, GENERATION_ERRORS):
+                    logger.error(f"Streamed report generation failed: {e}")
+                error = _generation_error(e)
+                yield _sse("error", {"status": error.status_code, "detail": error.detail})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.post("/generate-batch", response_model=BatchReportResponse)
+async def generate_reports_batch(
+    bodies: List[ReportRequest],
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Generate a report for each request in the list, concurrently. Failed
+    items don't stop the rest: every item gets a status, and a report
+    summary or the error /generate would have returned. The reports are
+    saved in one commit.
+    """
+    if not bodies:
+        raise HTTPException(status_code=422, detail="No report requests given")
+    if len(bodies) > settings.REPORT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.REPORT_BATCH_MAX_ITEMS} reports per batch, got {len(bodies)}",
+        )
+
+    outcomes = await prepare_reports(db, current_user["id"], bodies)
+    reports  = [o for o in outcomes if isinstance(o, Report)]
+    db.add_all(reports)
+    await db.commit()
+
+    items = []
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, Report):
+            items.append(BatchReportItem(index=index, status="ok", status_code=200, report=_to_list_item(outcome)))
+            continue
+        if not isinstance(outcome, GENERATION_ERRORS):
+            logger.error(f"Batch report {index} failed: {outcome!r}")
+        error = _generation_error(outcome)
+        items.append(BatchReportItem(index=index, status="error", status_code=error.status_code, error=error.detail))
+    logger.info(f"Batch of {len(bodies)} reports: {len(reports)} generated")
+    return BatchReportResponse(succeeded=len(reports), failed=len(bodies) - len(reports), items=items)
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobResponse)
+async def get_report_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Status of a report job; once it has succeeded, report_id names the report."""
+    return await _get_job(db, job_id, current_user["id"])
+
+
+@router.get("/jobs/{job_id}/events")
+async def report_job_events(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Server-sent events for a report job: a `status` event with the job each
+    time it changes, starting with its current state, until it succeeds or
+    fails. A comment line is sent while nothing changes to keep the
+    connection open.
+    """
+    await _get_job(db, job_id, current_user["id"])
+
+    async def events():
+        async for job in get_report_job_runner().follow(job_id):
+            if job is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse("status", ReportJobResponse.model_validate(job).model_dump(mode="json"))
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.get("/", response_model=List[ReportListItem])
 async def list_reports(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=settings.REPORT_LIST_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user),
 ):
-    """List all reports for the current user, newest first."""
-    result = await db.execute(
-        select(Report)
-        .where(Report.user_id == current_user["id"])
-        .order_by(Report.created_at.desc())
-    )
-    return [
-        ReportListItem(
-            id=r.id,
-            model_name=r.model_name,
-            org_name=r.org_name,
-            overall_risk=r.overall_risk,
-            readiness_pct=r.readiness_pct,
-            created_at=r.created_at,
+    """
+    List the current user's reports, newest first, a page at a time: up to
+    `limit` reports (REPORT_LIST_PAGE_SIZE by default). When there are more,
+    the X-Next-Cursor header carries the cursor that fetches the next page.
+
+    Pages are keyed on (created_at, id) rather than offsets, so every page
+    is one range scan of the (user_id, created_at DESC, id DESC) index,
+    however deep.
+    """
+    limit = limit or settings.REPORT_LIST_PAGE_SIZE
+    query = select(*LIST_COLUMNS).where(Report.user_id == current_user["id"])
+    if cursor:
+        created_at, report_id = _decode_cursor(cursor)
+        query = query.where(
+            Report.created_at <= created_at,   # the index range; the tie-break on id below is a filter
+            or_(Report.created_at < created_at, Report.id < report_id),
         )
-        for r in result.scalars().all()
-    ]
+    result = await db.execute(query.order_by(Report.created_at.desc(), Report.id.desc()).limit(limit + 1))
+    rows = result.all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(rows[-1].created_at, rows[-1].id)
+    return [_to_list_item(row) for row in rows]
 
 
 @router.get("/{report_id}", response_model=ReportResponse)
 async def get_report(
     report_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user),
 ):
-    result = await db.execute(
-        select(Report).where(Report.id == report_id, Report.user_id == current_user["id"])
-    )
-    report = result.scalar_one_or_none()
+    report = await _find_report(db, report_id, current_user["id"])
+    if not report and is_replica(db):   # may not have reached the replica yet
+        async with primary_on_miss() as primary:
+            report = await _find_report(primary, report_id, current_user["id"])
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
     return _to_response(report)
@@ -176,6 +244,67 @@ async def delete_report(
     return {"deleted": report_id}
 
 
+def _generation_error(e: Exception) -> HTTPException:
+    if isinstance(e, UploadNotFound):
+        return HTTPException(status_code=404, detail=str(e))
+    if isinstance(e, ScoringQueueFull):
+        return HTTPException(status_code=503, detail="Scoring queue is full, please retry shortly")
+    if isinstance(e, ScoringUnavailable):
+        return HTTPException(status_code=503, detail=f"{e}, please retry shortly")
+    if isinstance(e, ScoringTimeout):
+        return HTTPException(status_code=504, detail=str(e))
+    if isinstance(e, RescoreFailed):
+        return HTTPException(status_code=500, detail=str(e))
+    return HTTPException(status_code=500, detail="Report generation failed")
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _find_report(db: AsyncSession, report_id: str, user_id: str) -> Optional[Report]:
+    result = await db.execute(
+        select(Report)
+        .where(Report.id == report_id, Report.user_id == user_id)
+        .options(joinedload(Report.content))   # the compressed full report, only here
+    )
+    return result.scalar_one_or_none()
+
+
+async def _get_job(db: AsyncSession, job_id: str, user_id: str) -> ReportJob:
+    result = await db.execute(
+        select(ReportJob).where(ReportJob.id == job_id, ReportJob.user_id == user_id)
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
+
+
+def _encode_cursor(created_at: datetime, report_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{report_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, report_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), report_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _to_list_item(report) -> ReportListItem:
+    """From a Report, or a row of LIST_COLUMNS."""
+    return ReportListItem(
+        id=report.id,
+        model_name=report.model_name,
+        org_name=report.org_name,
+        overall_risk=report.overall_risk,
+        readiness_pct=report.readiness_pct,
+        created_at=report.created_at,
+    )
+
+
 def _to_response(report: Report) -> ReportResponse:
     return ReportResponse(
         id=report.id,
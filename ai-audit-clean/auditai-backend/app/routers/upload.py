@@ -1,89 +1,199 @@
 """
-/upload — accepts client's model output CSV or JSON,
-runs the real scoring engine, stores the file, returns computed scores.
+/upload — accepts client's model output CSV, JSON or NDJSON,
+stores the file, runs the real scoring engine, returns computed scores.
+
+Files are stored by content hash. Re-uploading identical content reuses the
+stored blob and its cached scores instead of storing and scoring it again.
+
+The request body is streamed (multipart_stream.py): the file is hashed and
+spooled to disk as it arrives, with no in-memory or spooled copy in between.
 """
-import io
-import json
+import asyncio
 import logging
-import pandas as pd
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from pathlib import Path
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
 from app.core.database import get_db
 from app.core.security import get_current_user
-from app.models.orm import Upload
-from app.services.scoring import compute_all_scores
-from app.services.storage import save_upload
+from app.models.orm import Blob, Upload
+from app.services.executor import ScoringQueueFull, ScoringTimeout, ScoringUnavailable, get_scoring_executor
+from app.services.ingest import NDJSON_EXTS, score_path
+from app.services.multipart_stream import InvalidUpload, receive_file
+from app.services.scoring import SCORING_ENGINE_VERSION
+from app.services.storage import (
+    BlobWriter, StoredBlob, columnar_path, delete_upload, persist_blob, release_blob,
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+UPLOAD_EXTS = ("csv", "json", *NDJSON_EXTS)
+
+# The body is read by receive_file rather than a File() parameter, so describe the form for the docs
+UPLOAD_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {"file": {"type": "string", "format": "binary"}},
+        }}},
+    },
+}
 
-@router.post("/")
+
+@router.post("/", openapi_extra=UPLOAD_FORM)
 async def upload_file(
-    file: UploadFile = File(...),
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
-    Upload a CSV or JSON file of model outputs.
-    Returns computed risk scores immediately.
+    Upload a CSV, JSON or NDJSON (.ndjson/.jsonl, one object per line) file
+    of model outputs. Returns computed risk scores immediately.
 
     Expected CSV columns (any subset works):
       decision, confidence, ground_truth, response,
       gender, race, age, prompt, explanation
     """
-    filename = file.filename or ""
-    ext = filename.lower().split(".")[-1]
+    # Hash and store the file as it is received; identical content is stored once
+    try:
+        filename, writer = await receive_file(request, "file", _open_writer)
+    except InvalidUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    ext    = filename.lower().split(".")[-1]
+    stored = await asyncio.to_thread(writer.close)
+
+    try:
+        blob = await _find_blob(db, stored.content_hash, ext)
+        if blob and blob.scores and blob.engine_version == SCORING_ENGINE_VERSION:
+            logger.info(f"Reusing cached scores for blob {stored.content_hash[:12]}")
+            await asyncio.to_thread(persist_blob, stored)
+            timings = None
+        else:
+            # Score from the local copy while it is persisted (a no-op for local storage)
+            persisted, result = await asyncio.gather(
+                asyncio.to_thread(persist_blob, stored), _score_blob(stored, ext), return_exceptions=True,
+            )
+            if isinstance(result, BaseException):
+                await _discard(db, stored, ext, result)
+                raise result
+            if isinstance(persisted, BaseException):
+                raise persisted
+            timings = result["timings"]
+    finally:
+        release_blob(stored)
+
+    if timings is not None:
+        blob = blob or Blob(content_hash=stored.content_hash, ext=ext, storage_path=stored.storage_path)
+        blob.columnar_path  = result["columnar_path"]
+        blob.size_bytes     = stored.size_bytes
+        blob.row_count      = result["row_count"]
+        blob.columns        = result["columns"]
+        blob.scores         = result["scores"]
+        blob.column_map     = result["column_map"]
+        blob.engine_version = result["engine_version"]
+
+    logger.info(f"Uploaded file: {filename}, rows: {blob.row_count}, cols: {blob.columns}")
+
+    # Save upload record to DB — a per-user reference to the shared blob
+    upload_record = await _save_upload_record(db, blob, current_user["id"], filename)
+
+    return {
+        "upload_id":    upload_record.id,
+        "filename":     filename,
+        "content_hash": stored.content_hash,
+        "row_count":    blob.row_count,
+        "columns":      blob.columns,
+        "column_map":   blob.column_map,
+        "scores":       blob.scores,
+        "cached":       timings is None,
+        "timings_ms":   {name: round(seconds * 1000, 1) for name, seconds in (timings or {}).items()},
+        "message":      f"Successfully processed {blob.row_count} rows. Scores computed from real data.",
+    }
+
 
-    if ext not in ("csv", "json"):
-        raise HTTPException(status_code=400, detail="Only CSV and JSON files are supported")
+async def _find_blob(db: AsyncSession, content_hash: str, ext: str) -> Optional[Blob]:
+    result = await db.execute(select(Blob).where(Blob.content_hash == content_hash, Blob.ext == ext))
+    return result.scalar_one_or_none()
 
-    # Read file content
-    content = await file.read()
 
-    # Parse into DataFrame
+def _open_writer(filename: str) -> BlobWriter:
+    if filename.lower().split(".")[-1] not in UPLOAD_EXTS:
+        raise InvalidUpload("Only CSV, JSON and NDJSON files are supported")
+    return BlobWriter(Path(filename).suffix.lower())
+
+
+async def _score_blob(stored: StoredBlob, ext: str) -> dict:
+    """Score a stored file on the scoring executor, from its local copy."""
     try:
-        if ext == "csv":
-            df = pd.read_csv(io.BytesIO(content))
-        else:
-            data = json.loads(content)
-            df = pd.DataFrame(data if isinstance(data, list) else [data])
+        result = await get_scoring_executor().run(
+            score_path, stored.local_path, ext, columnar_path(stored.content_hash, ext),
+        )
+    except ScoringQueueFull:
+        raise HTTPException(status_code=503, detail="Scoring queue is full, please retry shortly")
+    except ScoringUnavailable as e:
+        raise HTTPException(status_code=503, detail=f"{e}, please retry shortly")
+    except ScoringTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=422, detail=f"Failed to parse file: {str(e)}")
 
-    if df.empty:
+    if not result["row_count"]:
         raise HTTPException(status_code=422, detail="File contains no data rows")
+    return result
 
-    logger.info(f"Uploaded file: {filename}, rows: {len(df)}, cols: {list(df.columns)}")
 
-    # Run the real scoring engine
-    scores = compute_all_scores(df)
+async def _discard(db: AsyncSession, stored: StoredBlob, ext: str, error: BaseException) -> None:
+    """
+    Remove a newly stored file that turned out not to be scoreable. It is kept
+    after transient failures (scoring queue full, timeout), which a retry gets
+    past, and whenever a blob row references the content: a concurrent upload
+    of it succeeded, and the file is that blob's.
+    """
+    unscoreable = isinstance(error, HTTPException) and error.status_code == 422
+    if not (stored.created and unscoreable):
+        return
+    if await _find_blob(db, stored.content_hash, ext) is not None:
+        return
+    await asyncio.to_thread(delete_upload, stored.storage_path)
 
-    # Save file to storage
-    file.file = io.BytesIO(content)   # reset file pointer
-    file.filename = filename
-    storage_path, _ = await save_upload(file, current_user["id"])
 
-    # Save upload record to DB
-    upload_record = Upload(
-        user_id=current_user["id"],
-        filename=filename,
-        storage_path=storage_path,
-        row_count=len(df),
-    )
+async def _save_upload_record(db: AsyncSession, blob: Blob, user_id: str, filename: str) -> Upload:
+    """
+    Insert the upload (and the blob, if new). If a concurrent upload of the
+    same content created the blob first, attach to that one instead.
+    """
+    def record(blob: Blob) -> Upload:
+        return Upload(
+            user_id=user_id,
+            blob=blob,
+            filename=filename,
+            storage_path=blob.storage_path,
+            row_count=blob.row_count,
+            scores=blob.scores,
+            column_map=blob.column_map,
+            engine_version=blob.engine_version,
+        )
+
+    upload_record = record(blob)
     db.add(upload_record)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        existing = await _find_blob(db, blob.content_hash, blob.ext)
+        if existing is None:
+            raise
+        upload_record = record(existing)
+        db.add(upload_record)
+        await db.commit()
     await db.refresh(upload_record)
-
-    return {
-        "upload_id":   upload_record.id,
-        "filename":    filename,
-        "row_count":   len(df),
-        "columns":     list(df.columns),
-        "scores":      scores,
-        "message":     f"Successfully processed {len(df)} rows. Scores computed from real data.",
-    }
+    return upload_record
 
 
 @router.get("/sample-csv")
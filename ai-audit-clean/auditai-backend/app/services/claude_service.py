@@ -3,14 +3,27 @@ claude_service.py — Calls Anthropic Claude API to generate:
   - Executive summary
   - Intelligent recommendations
   - Compliance narrative
+
+One AsyncAnthropic client per server process (opened in the app lifespan)
+keeps its HTTPS connections alive between calls. At most LLM_MAX_CONCURRENCY
+calls are in flight at once; further ones wait their turn. Point
+ANTHROPIC_BASE_URL at benchmarks/stub_anthropic.py to run without the real API.
 """
+import asyncio
 import json
 import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Optional
 import anthropic
+import httpx
 from app.core.config import settings
+from app.services.llm_cache import get_llm_cache
 
 logger = logging.getLogger(__name__)
 
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
 COMPLIANCE_MAP = {
     "bias":           [("EU AI Act", "Art. 10(2)"), ("ISO 42001", "§6.1.2")],
     "hallucination":  [("NIST AI RMF", "GOVERN 1.1"), ("EU AI Act", "Art. 13")],
@@ -28,7 +41,11 @@ def risk_level(score: float) -> str:
     return "LOW"
 
 
-async def generate_ai_analysis(scores: dict, system_info: dict) -> dict:
+async def generate_ai_analysis(
+    scores: dict,
+    system_info: dict,
+    on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> dict:
     """
     Send real scores to Claude and get back:
       - executiveSummary
@@ -36,11 +53,26 @@ async def generate_ai_analysis(scores: dict, system_info: dict) -> dict:
       - recommendations (list)
       - readinessAssessment
       - complianceNarrative
+    Answers are cached by prompt (llm_cache.py), so repeating an audit
+    doesn't call Claude again. With on_text, the answer is streamed and
+    on_text is awaited with each piece of raw text as it arrives (not on a
+    cache hit or fallback).
     """
     if not settings.ANTHROPIC_API_KEY:
         logger.warning("No ANTHROPIC_API_KEY — returning rule-based analysis")
         return _rule_based_analysis(scores, system_info)
 
+    prompt = build_prompt(scores, system_info)
+    try:
+        return await get_llm_cache().get_or_compute(CLAUDE_MODEL, prompt, lambda: _call_claude(prompt, on_text))
+    except Exception as e:
+        logger.error(f"Claude API error: {e}")
+        _stats["failed"] += 1
+        return _rule_based_analysis(scores, system_info)
+
+
+def build_prompt(scores: dict, system_info: dict) -> str:
+    """The analysis prompt; fully determined by the scores and system_info."""
     risk_summary = "\n".join(
         f"  - {k.replace('_',' ').title()}: {v:.0%} ({risk_level(v)})"
         for k, v in scores.items()
@@ -53,7 +85,7 @@ async def generate_ai_analysis(scores: dict, system_info: dict) -> dict:
             for fw, ref in COMPLIANCE_MAP.get(metric, []):
                 compliance_refs.append(f"{fw} {ref} ({metric.replace('_',' ')})")
 
-    prompt = f"""You are a senior AI compliance expert producing a formal regulatory audit report.
+    return f"""You are a senior AI compliance expert producing a formal regulatory audit report.
 
 SYSTEM BEING AUDITED:
 - Organisation: {system_info.get('org_name', 'Not specified')}
@@ -89,21 +121,92 @@ Produce a JSON response with this exact structure (pure JSON, no markdown):
 
 Provide 3-5 recommendations, prioritised by risk level. Be specific to the use case and scores provided."""
 
-    try:
-        client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1500,
-            messages=[{"role": "user", "content": prompt}]
+
+async def _call_claude(prompt: str, on_text: Optional[Callable[[str], Awaitable[None]]] = None) -> dict:
+    request = {
+        "model":      CLAUDE_MODEL,
+        "max_tokens": 1500,
+        "messages":   [{"role": "user", "content": prompt}],
+    }
+    async with _llm_slot():
+        if on_text is None:
+            message = await get_client().messages.create(**request)
+        else:
+            async with get_client().messages.stream(**request) as stream:
+                async for text in stream.text_stream:
+                    await on_text(text)
+                message = await stream.get_final_message()
+    raw = message.content[0].text
+    cleaned = raw.replace("```json", "").replace("```", "").strip()
+    result = json.loads(cleaned)
+    logger.info("Claude AI analysis generated successfully")
+    return result
+
+
+# ── Shared client ─────────────────────────────────────────────────────────────
+
+_client: Optional[anthropic.AsyncAnthropic] = None
+_slots:  Optional[asyncio.Semaphore] = None
+_stats = {"in_flight": 0, "waiting": 0, "completed": 0, "failed": 0, "busy_s": 0.0}
+
+
+def get_client() -> anthropic.AsyncAnthropic:
+    """The process-wide client, created on first use."""
+    global _client
+    if _client is None:
+        limits = httpx.Limits(
+            max_connections=settings.LLM_MAX_CONCURRENCY,
+            max_keepalive_connections=settings.LLM_MAX_CONCURRENCY,
+            keepalive_expiry=settings.LLM_KEEPALIVE_S,
         )
-        raw = message.content[0].text
-        cleaned = raw.replace("```json", "").replace("```", "").strip()
-        result = json.loads(cleaned)
-        logger.info("Claude AI analysis generated successfully")
-        return result
-    except Exception as e:
-        logger.error(f"Claude API error: {e}")
-        return _rule_based_analysis(scores, system_info)
+        _client = anthropic.AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL or None,
+            timeout=httpx.Timeout(settings.LLM_TIMEOUT_S, connect=settings.LLM_CONNECT_TIMEOUT_S),
+            max_retries=settings.LLM_MAX_RETRIES,
+            http_client=anthropic.DefaultAsyncHttpxClient(limits=limits),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the client's connections; the next call opens a new client (and loop-bound limiter)."""
+    global _client, _slots
+    if _client is not None:
+        await _client.close()
+    _client, _slots = None, None
+
+
+@asynccontextmanager
+async def _llm_slot():
+    """Hold one of the LLM_MAX_CONCURRENCY slots for the duration of a call."""
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    slots = _slots
+    _stats["waiting"] += 1
+    try:
+        await slots.acquire()
+    finally:
+        _stats["waiting"] -= 1
+    _stats["in_flight"] += 1
+    started = time.perf_counter()
+    try:
+        yield
+        _stats["completed"] += 1
+    finally:
+        _stats["in_flight"] -= 1
+        _stats["busy_s"] += time.perf_counter() - started
+        slots.release()
+
+
+def llm_stats() -> dict:
+    return {
+        "max_concurrency": settings.LLM_MAX_CONCURRENCY,
+        **_stats,
+        "busy_s": round(_stats["busy_s"], 3),
+        "cache":  get_llm_cache().stats(),
+    }
 
 
 def _rule_based_analysis(scores: dict, system_info: dict) -> dict:
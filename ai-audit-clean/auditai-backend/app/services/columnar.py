@@ -0,0 +1,127 @@
+"""
+columnar.py — compressed Parquet copies of uploads, for cheap re-reads.
+
+At ingest, the rows that are parsed for scoring are also written to a Parquet
+file next to the stored upload. Later reads (re-scoring after an engine
+upgrade, re-audits) load that copy memory-mapped and only for the columns
+the scorers use, instead of parsing the whole CSV/JSON text again.
+
+CSV uploads are parsed for the scoring columns only (see ingest.py), so the
+copy may hold fewer columns than the upload; the upload's full header is kept
+in the file metadata under SOURCE_COLUMNS_KEY.
+
+pyarrow is pinned in requirements.txt; where it isn't installed no copies are
+written and reads fall back to the raw file. The copy is best-effort: if a chunk can't be converted to the
+schema of the first one (a column changes type mid-file), it is abandoned.
+"""
+import json
+import logging
+import os
+import pandas as pd
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SOURCE_COLUMNS_KEY = b"auditai.source_columns"
+
+
+class ColumnarCopyUnusable(Exception):
+    """The copy lacks columns the current scorers read; re-parse the raw file instead."""
+
+
+class ColumnarLayout(NamedTuple):
+    columns:        list[str]   # columns stored in the copy
+    source_columns: list[str]   # header of the upload it was written from
+    rows:           int
+
+
+def columnar_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ColumnarWriter:
+    """
+    Appends DataFrame chunks to a Parquet file, one row group per chunk.
+    Written to a temporary name and renamed on close(), so a partial copy
+    is never visible.
+    """
+
+    def __init__(self, path: str, source_columns: Optional[list[str]] = None):
+        self.path    = path
+        self.tmp     = f"{path}.tmp-{os.getpid()}"
+        self.source_columns = source_columns
+        self.writer  = None
+        self.schema  = None
+        self.failed  = False
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.failed:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self.writer is None:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                self.schema = table.schema
+                if self.source_columns is not None:
+                    self.schema = self.schema.with_metadata({
+                        **(self.schema.metadata or {}),
+                        SOURCE_COLUMNS_KEY: json.dumps(self.source_columns),
+                    })
+                self.writer = pq.ParquetWriter(self.tmp, self.schema, compression=settings.COLUMNAR_COMPRESSION)
+            elif not table.schema.equals(self.schema):
+                table = table.cast(self.schema)
+            self.writer.write_table(table)
+        except (pa.ArrowException, ValueError, TypeError) as e:
+            logger.warning(f"Abandoning columnar copy {self.path}: {e}")
+            self.abort()
+
+    def abort(self) -> None:
+        self.failed = True
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        Path(self.tmp).unlink(missing_ok=True)
+
+    def close(self) -> Optional[str]:
+        """Finish the file; returns its path, or None if nothing usable was written."""
+        if self.failed or self.writer is None:
+            return None
+        self.writer.close()
+        os.replace(self.tmp, self.path)
+        logger.info(f"Wrote columnar copy {self.path}")
+        return self.path
+
+
+def tee_chunks(chunks: Iterator[pd.DataFrame], writer: ColumnarWriter) -> Iterator[pd.DataFrame]:
+    """Yield chunks unchanged while also appending each to writer."""
+    for chunk in chunks:
+        writer.write(chunk)
+        yield chunk
+
+
+def read_layout(path: str) -> ColumnarLayout:
+    """Stored columns, source header and row count of a Parquet copy, read from its footer only."""
+    import pyarrow.parquet as pq
+    metadata = pq.read_metadata(path, memory_map=True)
+    columns  = list(metadata.schema.to_arrow_schema().names)
+    source   = (metadata.metadata or {}).get(SOURCE_COLUMNS_KEY)
+    return ColumnarLayout(columns, json.loads(source) if source else columns, metadata.num_rows)
+
+
+def read_frame(path: str, columns: list[str]) -> pd.DataFrame:
+    return pd.read_parquet(path, columns=columns, memory_map=True)
+
+
+def iter_batches(path: str, columns: list[str], batch_rows: int) -> Iterator[pd.DataFrame]:
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(path, memory_map=True)
+    for batch in parquet.iter_batches(batch_size=batch_rows, columns=columns):
+        yield batch.to_pandas()
@@ -0,0 +1,210 @@
+"""
+executor.py — runs CPU-bound scoring off the event loop.
+
+Scoring jobs go to a process pool of SCORING_WORKERS processes (0 runs them
+one at a time on a thread of the server process instead). At most
+SCORING_MAX_QUEUE jobs may be waiting or running at once; further jobs are
+rejected straight away with ScoringQueueFull rather than piling up behind a
+slow upload. Each job is given SCORING_JOB_TIMEOUT_S seconds.
+
+A job that times out or whose caller is cancelled is cancelled if it has
+not started yet. A job already running in a worker cannot be interrupted:
+its result is discarded, and it keeps its queue slot until it finishes so
+the bound stays honest.
+
+A worker that dies (killed for memory, say) breaks a ProcessPoolExecutor for
+good. The jobs it had fail with ScoringUnavailable, and the pool is replaced
+so the next job runs on fresh workers.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ScoringQueueFull(Exception):
+    """Raised when SCORING_MAX_QUEUE jobs are already waiting or running."""
+
+
+class ScoringTimeout(Exception):
+    """Raised when a job does not finish within its timeout."""
+
+
+class ScoringUnavailable(Exception):
+    """Raised when a worker died under the job; the pool has been replaced, so a retry can run."""
+
+
+def _timed_call(fn: Callable, args: tuple) -> tuple[float, Any]:
+    """Runs in the worker; returns the start time with the result so queue wait can be measured."""
+    return time.time(), fn(*args)
+
+
+def _init_worker() -> None:
+    if settings.TOXICITY_WARMUP:
+        from app.services.toxicity import warm_toxicity_model
+        warm_toxicity_model()
+
+
+class ScoringExecutor:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.workers   = settings.SCORING_WORKERS if workers is None else workers
+        self.max_queue = max_queue or settings.SCORING_MAX_QUEUE
+        self.timeout   = timeout or settings.SCORING_JOB_TIMEOUT_S
+
+        self._pool: Optional[Executor] = None
+        self._lock    = threading.Lock()
+        self._pending = 0
+        self._counts  = {"completed": 0, "failed": 0, "timed_out": 0, "cancelled": 0, "rejected": 0, "restarts": 0}
+        self._latency = deque(maxlen=500)   # seconds from submit to result, recent jobs
+        self._wait    = deque(maxlen=500)   # seconds spent queued before a worker picked the job up
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._new_pool()
+
+    def _new_pool(self) -> Executor:
+        if self.workers <= 0:
+            logger.info(f"Scoring executor started in-process, queue {self.max_queue}")
+            return ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+        logger.info(f"Scoring executor started: {self.workers} workers, queue {self.max_queue}")
+        # spawn, not fork: the server process has an event loop and threads running
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def _replace_broken(self, pool: Executor) -> None:
+        """Swap a pool a dead worker broke for a new one, once however many jobs notice."""
+        with self._lock:
+            if self._pool is not pool:
+                return   # already replaced
+            self._pool = self._new_pool()
+            self._counts["restarts"] += 1
+        logger.error("A scoring worker died; replaced the worker pool")
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info("Scoring executor stopped")
+
+    # ── Jobs ──────────────────────────────────────────────────────────────────
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run fn(*args) on the pool and return its result.
+        fn and its arguments must be picklable (a module-level function).
+        Raises ScoringQueueFull, ScoringTimeout, ScoringUnavailable, or
+        whatever fn raised.
+        """
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self._counts["rejected"] += 1
+                raise ScoringQueueFull(f"{self._pending} scoring jobs already queued")
+            self._pending += 1
+
+        submitted = time.time()
+        try:
+            self.start()
+            pool = self._pool
+            job  = pool.submit(_timed_call, fn, args)
+        except BrokenProcessPool as e:
+            self._release()
+            self._replace_broken(pool)
+            raise ScoringUnavailable("Scoring workers are restarting") from e
+        except Exception:
+            self._release()
+            raise
+        # Released when the worker is really done, not when the caller gives up
+        job.add_done_callback(lambda _: self._release())
+
+        timeout = timeout or self.timeout
+        try:
+            started, result = await asyncio.wait_for(asyncio.wrap_future(job), timeout)
+        except asyncio.TimeoutError:
+            job.cancel()
+            self._count("timed_out")
+            logger.warning(f"Scoring job {getattr(fn, '__name__', fn)} timed out after {timeout}s")
+            raise ScoringTimeout(f"Scoring did not finish within {timeout:g}s")
+        except asyncio.CancelledError:
+            job.cancel()
+            self._count("cancelled")
+            raise
+        except BrokenProcessPool as e:
+            self._count("failed")
+            self._replace_broken(pool)
+            raise ScoringUnavailable("A scoring worker died while running the job") from e
+        except Exception:
+            self._count("failed")
+            raise
+
+        finished = time.time()
+        with self._lock:
+            self._counts["completed"] += 1
+            self._latency.append(finished - submitted)
+            self._wait.append(max(started - submitted, 0.0))
+        return result
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._counts[outcome] += 1
+
+    # ── Stats ─────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        with self._lock:
+            latency = sorted(self._latency)
+            wait    = sorted(self._wait)
+            return {
+                "workers":      self.workers,
+                "max_queue":    self.max_queue,
+                "queue_depth":  self._pending,
+                **self._counts,
+                "latency_s":    _summary(latency),
+                "queue_wait_s": _summary(wait),
+            }
+
+
+def _summary(values: list[float]) -> dict:
+    if not values:
+        return {"avg": None, "p50": None, "p95": None, "max": None}
+    pick = lambda q: round(values[min(int(q * len(values)), len(values) - 1)], 3)
+    return {
+        "avg": round(sum(values) / len(values), 3),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "max": round(values[-1], 3),
+    }
+
+
+_executor: Optional[ScoringExecutor] = None
+
+
+def get_scoring_executor() -> ScoringExecutor:
+    """Process-wide executor, created on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ScoringExecutor()
+    return _executor
@@ -0,0 +1,436 @@
+"""
+ingest.py — turns uploaded files into scores.
+
+Small files are parsed whole and scored with compute_all_scores. CSV and
+NDJSON (newline-delimited JSON, .ndjson/.jsonl) files of
+SCORING_STREAM_THRESHOLD_MB or more are read SCORING_CHUNK_ROWS rows at a
+time and folded into a ScoreAccumulator, so peak memory depends on the
+chunk size rather than the file size.
+
+CSV files are parsed for the scoring columns only: the header is read first,
+the alias lists in scoring.py are resolved against it, and the rest of the
+columns are skipped by the parser. Decision and protected-attribute columns
+are parsed as category and confidence as float32 (whole-file parses only —
+chunk memory is already bounded by SCORING_CHUNK_ROWS). Chunked parses read
+the label columns (label_columns) as strings instead, in every chunk, so a
+value parses the same whichever chunk it lands in rather than by what the
+rest of its chunk holds; the scorers spell numeric labels one way
+(scoring.canonical_label) whichever dtype they were parsed with.
+
+Whole-file parses use the engines picked by INGEST_CSV_ENGINE (pandas' C
+parser or pyarrow's multithreaded one) and INGEST_JSON_ENGINE (json, or
+orjson decoded straight into the needed columns). Both produce the same
+DataFrame as the default; an engine that isn't installed, or can't read a
+particular file, falls back to the default. Chunked CSV parsing always uses
+the C parser, the only one pandas can read in chunks.
+
+When given a columnar_path, the parsed rows are also written there as
+Parquet (see columnar.py); score_columnar re-scores from that copy.
+"""
+import json
+import logging
+import os
+import numpy as np
+import pandas as pd
+from typing import IO, Callable, Iterator, Optional, Union
+from app.core.config import settings
+from app.services import columnar
+from app.services.accumulators import ScoreAccumulator
+from app.services.scoring import (
+    SCORING_ENGINE_VERSION, ScoringContext, compute_all_scores_timed, resolve_columns, scoring_columns,
+)
+
+logger = logging.getLogger(__name__)
+
+Source = Union[str, IO[bytes]]
+
+NDJSON_EXTS = ("ndjson", "jsonl")
+
+
+def read_frame(source: Source, ext: str, header: Optional[list[str]] = None) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Parse a whole CSV, JSON or NDJSON file. Returns the DataFrame and the
+    file's column names, which the frame may hold only some of: given the
+    CSV's header (sniff_columns), only the scoring columns are parsed, with
+    compact dtypes, and the orjson engine and NDJSON reader only build the
+    scoring columns.
+    """
+    if ext == "csv":
+        if header is None:
+            df = pd.read_csv(source)
+            return df, list(df.columns)
+        return _read_csv_projected(source, header), header
+    if ext in NDJSON_EXTS:
+        reader = NdjsonReader(source, chunk_rows=0)
+        return next(iter(reader), pd.DataFrame()), reader.columns
+
+    raw = _read_bytes(source)
+    if json_engine() == "orjson":
+        try:
+            return _read_json_columns(raw)
+        except ValueError as e:
+            # orjson is stricter than json (no NaN literals, 64-bit integers only)
+            logger.info(f"orjson could not decode the file ({e}), falling back to json")
+    data = json.loads(raw)
+    df = pd.DataFrame(data if isinstance(data, list) else [data])
+    return df, list(df.columns)
+
+
+def csv_engine() -> str:
+    """The pd.read_csv engine for whole-file parses: INGEST_CSV_ENGINE if it can be used, else "c"."""
+    if settings.INGEST_CSV_ENGINE == "pyarrow" and columnar.columnar_available():
+        return "pyarrow"
+    return "c"
+
+
+def json_engine() -> str:
+    """INGEST_JSON_ENGINE if it can be used, else "json"."""
+    if settings.INGEST_JSON_ENGINE == "orjson":
+        try:
+            import orjson  # noqa: F401
+            return "orjson"
+        except ImportError:
+            pass
+    return "json"
+
+
+def should_stream(ext: str, size_bytes: Optional[int]) -> bool:
+    """Chunked scoring applies to CSV and NDJSON files at or above the configured size."""
+    if ext not in ("csv", *NDJSON_EXTS) or size_bytes is None:
+        return False
+    return size_bytes >= settings.SCORING_STREAM_THRESHOLD_MB * 1024 * 1024
+
+
+def sniff_columns(source: Source) -> list[str]:
+    """A CSV's column names, from its header line alone."""
+    columns = list(pd.read_csv(source, nrows=0).columns)
+    _rewind(source)
+    return columns
+
+
+def parse_plan(header: list[str], compact_confidence: bool = True) -> tuple[list[str], dict]:
+    """
+    (usecols, dtype) for pd.read_csv: the columns the scorers read, with
+    decision and protected-attribute columns as category and, optionally,
+    confidence as float32 (widened back exactly by ScoringContext).
+    """
+    column_map = resolve_columns(header)
+    usecols    = scoring_columns(header) or header[:1]   # one column keeps the row count
+    dtypes     = {col: "category" for col in [column_map["decision"], *column_map["protected"]] if col}
+    if compact_confidence and column_map["confidence"]:
+        dtypes[column_map["confidence"]] = np.float32
+    return usecols, dtypes
+
+
+def label_columns(header: list[str]) -> list[str]:
+    """The columns the scorers compare as labels: decision, ground truth, protected attributes and prompt."""
+    column_map = resolve_columns(header)
+    labels = [column_map["decision"], column_map["ground_truth"], column_map["prompt"], *column_map["protected"]]
+    return list(dict.fromkeys(col for col in labels if col))
+
+
+def iter_csv_chunks(
+    source: Source,
+    chunk_rows: Optional[int] = None,
+    header: Optional[list[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    if header is None:
+        header = sniff_columns(source)
+    usecols = scoring_columns(header) or header[:1]
+    dtypes  = dict.fromkeys(label_columns(header), str)
+    with pd.read_csv(
+        source, chunksize=chunk_rows or settings.SCORING_CHUNK_ROWS, usecols=usecols, dtype=dtypes,
+    ) as reader:
+        yield from reader
+
+
+class NdjsonReader:
+    """
+    Parses newline-delimited JSON (one object per line) into DataFrames of
+    chunk_rows records (0 = all of them), holding one batch of records at a
+    time. Blank lines are skipped.
+
+    The first batch is parsed on construction; its keys are the file's
+    columns, and every batch is built with just the scoring columns among
+    them, so all chunks share one layout. A key that first appears in a
+    later batch is ignored, unless the scorers would read it: then the file
+    is rejected (ValueError) rather than scored without it.
+    """
+
+    def __init__(self, source: Source, chunk_rows: Optional[int] = None):
+        self.chunk_rows = settings.SCORING_CHUNK_ROWS if chunk_rows is None else chunk_rows
+        self.lines   = _iter_lines(source)
+        self.line_no = 0
+        self.loads   = _json_loads()
+        self.known: Optional[set] = None   # keys seen so far, once the first batch has set the columns
+        first = self._read_batch()
+        self.columns = list(dict.fromkeys(key for record in first for key in record))
+        self.needed  = scoring_columns(self.columns) or self.columns[:1]
+        self.labels  = label_columns(self.columns)
+        self.known   = set(self.columns)
+        self.first   = first
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        records, self.first = self.first, None
+        while records:
+            yield _records_frame(records, self.needed, self.labels)
+            records = self._read_batch()
+
+    def _read_batch(self) -> list[dict]:
+        records = []
+        for line in self.lines:
+            self.line_no += 1
+            if not line.strip():
+                continue
+            try:
+                record = self.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON on line {self.line_no}: {e}") from None
+            if not isinstance(record, dict):
+                raise ValueError(f"Line {self.line_no} is not a JSON object")
+            if self.known is not None and not self.known.issuperset(record):
+                self._check_new_keys(record)
+            records.append(record)
+            if len(records) == self.chunk_rows:
+                break
+        return records
+
+    def _check_new_keys(self, record: dict) -> None:
+        for key in record:
+            if key in self.known:
+                continue
+            if scoring_columns([*self.columns, key]) != scoring_columns(self.columns):
+                raise ValueError(
+                    f"Line {self.line_no} adds column '{key}', which the first {self.chunk_rows} records "
+                    f"don't have; put every scored key in the first records, or send the file as JSON"
+                )
+            self.known.add(key)
+
+
+def _iter_lines(source: Source) -> Iterator[bytes]:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            yield from f
+    else:
+        yield from source
+
+
+def _json_loads() -> Callable[[bytes], object]:
+    """orjson.loads when INGEST_JSON_ENGINE selects it, falling back to json for what orjson rejects."""
+    if json_engine() != "orjson":
+        return json.loads
+    import orjson
+
+    def loads(raw: bytes) -> object:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            return json.loads(raw)
+    return loads
+
+
+def _records_frame(records: list[dict], columns: list[str], labels: tuple = ()) -> pd.DataFrame:
+    """
+    pd.DataFrame(records)[columns] without building the other columns;
+    missing keys become NaN. Columns in labels hold strings (str(value), as
+    astype(str) gives) whatever JSON type each record used.
+    """
+    return pd.DataFrame({
+        col: [_label(r.get(col)) for r in records] if col in labels else [r.get(col, np.nan) for r in records]
+        for col in columns
+    })
+
+
+def _label(value) -> object:
+    if value is None or (isinstance(value, float) and value != value):
+        return np.nan
+    return value if isinstance(value, str) else str(value)
+
+
+def _read_csv_projected(source: Source, header: list[str]) -> pd.DataFrame:
+    engine = csv_engine()
+    usecols, dtypes = parse_plan(header)
+    try:
+        df = pd.read_csv(source, usecols=usecols, dtype=dtypes, engine=engine)
+    except ValueError as e:
+        # Confidence column holds something float32 can't parse, or pyarrow can't
+        # read the file (e.g. ragged rows); re-read it as the C parser infers it
+        logger.info(f"Compact {engine} parse failed ({e}), re-reading with inferred dtypes")
+        _rewind(source)
+        engine = "c"
+        usecols, dtypes = parse_plan(header, compact_confidence=False)
+        df = pd.read_csv(source, usecols=usecols, dtype=dtypes)
+    if engine == "pyarrow":
+        df = _as_parsed(df, "csv")
+    return _numeric_categories(df)
+
+
+def _read_json_columns(raw: bytes) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Decode a JSON array of records with orjson and build only the scoring
+    columns from it. Keys missing from a record become NaN, as they do in
+    pd.DataFrame(records).
+    """
+    import orjson
+    data = orjson.loads(raw)
+    records = data if isinstance(data, list) else [data]
+    if not all(isinstance(r, dict) for r in records):
+        df = pd.DataFrame(records)
+        return df, list(df.columns)
+
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    needed  = scoring_columns(columns) or columns[:1]
+    return _records_frame(records, needed), columns
+
+
+def _read_bytes(source: Source) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    return source.read()
+
+
+def _numeric_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Categorical columns whose values are all numbers go back to numbers, so
+    "1"/"1.0" decisions and ages stringify exactly as without the category
+    dtype (pandas parses categories as strings).
+    """
+    for col in df.select_dtypes(include="category").columns:
+        categories = df[col].cat.categories
+        if len(categories) and pd.to_numeric(categories, errors="coerce").notna().all():
+            df[col] = pd.to_numeric(df[col].astype(object))
+    return df
+
+
+def _rewind(source: Source) -> None:
+    if not isinstance(source, str):
+        source.seek(0)
+
+
+def score_chunks(chunks: Iterator[pd.DataFrame]) -> ScoreAccumulator:
+    accumulator = ScoreAccumulator()
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator
+
+
+def score_source(
+    source: Source,
+    ext: str,
+    size_bytes: Optional[int] = None,
+    columnar_path: Optional[str] = None,
+) -> dict:
+    """
+    Score a file, streaming it when it is large enough.
+    Returns {"scores", "row_count", "columns", "column_map", "engine_version",
+    "timings", "columnar_path"}; row_count is 0 for empty files, timings holds
+    the seconds spent on each metric, and columnar_path is set only if a
+    columnar copy was written.
+    """
+    header = sniff_columns(source) if ext == "csv" else None
+    writer = None
+    if columnar_path and settings.COLUMNAR_COPY and columnar.columnar_available():
+        writer = columnar.ColumnarWriter(columnar_path, header)
+
+    try:
+        if should_stream(ext, size_bytes):
+            logger.info(f"Streaming scores over {size_bytes} bytes in chunks of {settings.SCORING_CHUNK_ROWS} rows")
+            if ext == "csv":
+                chunks = iter_csv_chunks(source, header=header)
+            else:
+                reader = NdjsonReader(source)
+                chunks, header = iter(reader), reader.columns
+            if writer:
+                writer.source_columns = header
+                chunks = columnar.tee_chunks(chunks, writer)
+            accumulator = score_chunks(chunks)
+            accumulator.columns = header
+            return _accumulated_result(accumulator, writer)
+
+        df, columns = read_frame(source, ext, header)
+        if df.empty:
+            return _result({}, 0, columns, {}, {})
+        if writer:
+            writer.source_columns = columns
+            writer.write(df)
+        scores, timings = compute_all_scores_timed(df)
+        return _result(scores, len(df), columns, ScoringContext(df).column_map(), timings, writer)
+    except Exception:
+        if writer:
+            writer.abort()
+        raise
+
+
+def score_columnar(path: str, ext: str) -> dict:
+    """
+    Score a columnar copy written by score_source for a file of type ext,
+    reading only the columns the scorers use. Same result shape as score_source.
+    Raises ColumnarCopyUnusable when the copy was projected for scorers that
+    read fewer columns than the current ones.
+    """
+    stored, columns, rows = columnar.read_layout(path)
+    needed = scoring_columns(columns) or columns[:1]   # one column keeps the row count
+    missing = [c for c in needed if c not in stored]
+    if missing:
+        raise columnar.ColumnarCopyUnusable(f"{path} has no column(s) {missing}")
+    logger.info(f"Scoring columnar copy {path}: {len(needed)} of {len(columns)} columns, {rows} rows")
+
+    if rows > settings.SCORING_CHUNK_ROWS:
+        batches = columnar.iter_batches(path, needed, settings.SCORING_CHUNK_ROWS)
+        accumulator = score_chunks(_as_parsed(batch, ext) for batch in batches)
+        accumulator.columns = columns
+        return _accumulated_result(accumulator)
+
+    df = _as_parsed(columnar.read_frame(path, needed), ext)
+    if df.empty:
+        return _result({}, 0, columns, {}, {})
+    scores, timings = compute_all_scores_timed(df)
+    return _result(scores, len(df), columns, ScoringContext(df).column_map(), timings)
+
+
+def _as_parsed(df: pd.DataFrame, ext: str) -> pd.DataFrame:
+    """
+    Missing strings come back from Parquet (and pd.read_csv's pyarrow engine)
+    as None, where the C parser gives NaN; the scorers stringify the two
+    differently, so restore NaN for CSV.
+    """
+    if ext == "csv":
+        text_cols = df.select_dtypes(include="object").columns
+        if len(text_cols):
+            df[text_cols] = df[text_cols].where(df[text_cols].notna(), np.nan)
+    return df
+
+
+def _accumulated_result(accumulator: ScoreAccumulator, writer: Optional[columnar.ColumnarWriter] = None) -> dict:
+    if not accumulator.rows:
+        if writer:
+            writer.abort()
+        return _result({}, 0, accumulator.columns, {}, {})
+    return _result(
+        accumulator.scores(), accumulator.rows, accumulator.columns,
+        accumulator.column_map, accumulator.timings, writer,
+    )
+
+
+def _result(
+    scores: dict,
+    row_count: int,
+    columns: list,
+    column_map: dict,
+    timings: dict,
+    writer: Optional[columnar.ColumnarWriter] = None,
+) -> dict:
+    return {
+        "scores":         scores,
+        "row_count":      row_count,
+        "columns":        columns,
+        "column_map":     column_map,
+        "engine_version": SCORING_ENGINE_VERSION,
+        "timings":        timings,
+        "columnar_path":  writer.close() if writer else None,
+    }
+
+
+def score_path(path: str, ext: str, columnar_path: Optional[str] = None) -> dict:
+    return score_source(path, ext, os.path.getsize(path), columnar_path)
@@ -0,0 +1,192 @@
+"""
+llm_cache.py — caches Claude analyses by prompt, in memory and in the database.
+
+build_prompt renders everything an analysis depends on, so the cache key is
+a hash of the model name and the normalised prompt (whitespace collapsed).
+A lookup tries an in-process LRU of LLM_CACHE_MEMORY_ENTRIES entries, then
+the llm_cache table (shared by every process, kept across restarts), and
+only then calls Claude. Entries expire LLM_CACHE_TTL_S after they were
+stored. The table keeps the LLM_CACHE_DB_MAX_ENTRIES newest entries.
+
+Concurrent lookups of one key in a process share a single call. A database
+error turns a lookup into a miss rather than a failure. Only answers from
+Claude are stored; the rule-based fallback never is.
+"""
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import delete, select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.orm import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+PRUNE_EVERY = 100   # stores between trims of the table
+
+
+def cache_key(model: str, prompt: str) -> str:
+    normalised = "\n".join(" ".join(line.split()) for line in prompt.strip().splitlines())
+    return hashlib.sha256(f"{model}\n{normalised}".encode()).hexdigest()
+
+
+class LLMCache:
+    def __init__(
+        self,
+        ttl_s: Optional[int] = None,
+        memory_entries: Optional[int] = None,
+        db_max_entries: Optional[int] = None,
+    ):
+        self.ttl_s          = settings.LLM_CACHE_TTL_S if ttl_s is None else ttl_s
+        self.memory_entries = memory_entries or settings.LLM_CACHE_MEMORY_ENTRIES
+        self.db_max_entries = db_max_entries or settings.LLM_CACHE_DB_MAX_ENTRIES
+
+        self._memory: OrderedDict[str, tuple[datetime, dict]] = OrderedDict()   # key → (expires_at, result)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stores  = 0
+        self._counts  = {"memory_hits": 0, "db_hits": 0, "shared": 0, "misses": 0, "evicted": 0, "errors": 0}
+
+    async def get_or_compute(self, model: str, prompt: str, compute: Callable[[], Awaitable[dict]]) -> dict:
+        """The cached analysis for (model, prompt), or compute() stored as it."""
+        if self.ttl_s <= 0:
+            return await compute()
+        key = cache_key(model, prompt)
+
+        result = self._memory_get(key)
+        if result is not None:
+            self._counts["memory_hits"] += 1
+            return result
+
+        while key in self._inflight:
+            pending = self._inflight[key]
+            try:
+                result = await asyncio.shield(pending)
+                self._counts["shared"] += 1
+                return result
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise   # this caller was cancelled, not the one making the call
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result, expires_at = await self._db_get(key)
+            if result is not None:
+                self._counts["db_hits"] += 1
+            else:
+                self._counts["misses"] += 1
+                result = await compute()
+                expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_s)
+                await self._db_put(key, model, result, expires_at)
+            self._memory_put(key, result, expires_at)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()   # retrieved here, so an unshared failure isn't logged as lost
+            raise
+        finally:
+            del self._inflight[key]
+
+    # ── Memory tier ───────────────────────────────────────────────────────────
+
+    def _memory_get(self, key: str) -> Optional[dict]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= datetime.utcnow():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return result
+
+    def _memory_put(self, key: str, result: dict, expires_at: datetime) -> None:
+        self._memory[key] = (expires_at, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    # ── Database tier ─────────────────────────────────────────────────────────
+
+    async def _db_get(self, key: str) -> tuple[Optional[dict], Optional[datetime]]:
+        now = datetime.utcnow()
+        try:
+            async with AsyncSessionLocal() as db:
+                entry = await db.get(LLMCacheEntry, key)
+                if entry is None or entry.expires_at <= now:
+                    return None, None
+                await db.execute(
+                    update(LLMCacheEntry)
+                    .where(LLMCacheEntry.key == key)
+                    .values(hits=LLMCacheEntry.hits + 1, last_hit_at=now)
+                )
+                await db.commit()
+                return entry.result, entry.expires_at
+        except Exception as e:
+            self._counts["errors"] += 1
+            logger.warning(f"LLM cache lookup failed, treating as a miss: {e}")
+            return None, None
+
+    async def _db_put(self, key: str, model: str, result: dict, expires_at: datetime) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.merge(LLMCacheEntry(
+                    key=key, model=model, result=result, hits=0,
+                    created_at=datetime.utcnow(), expires_at=expires_at, last_hit_at=None,
+                ))
+                await db.commit()
+            self._stores += 1
+            if self._stores % PRUNE_EVERY == 1:
+                await self.prune()
+        except Exception as e:
+            self._counts["errors"] += 1
+            logger.warning(f"LLM cache store failed: {e}")
+
+    async def prune(self) -> int:
+        """Drop expired entries, then the oldest beyond db_max_entries; returns how many went."""
+        async with AsyncSessionLocal() as db:
+            expired = await db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.expires_at <= datetime.utcnow()))
+            removed = expired.rowcount
+            cutoff = await db.scalar(
+                select(LLMCacheEntry.created_at)
+                .order_by(LLMCacheEntry.created_at.desc())
+                .offset(self.db_max_entries - 1)
+                .limit(1)
+            )
+            if cutoff is not None:
+                oldest = await db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.created_at < cutoff))
+                removed += oldest.rowcount
+            await db.commit()
+        self._counts["evicted"] += removed
+        return removed
+
+    # ── Stats ─────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        hits    = self._counts["memory_hits"] + self._counts["db_hits"] + self._counts["shared"]
+        lookups = hits + self._counts["misses"]
+        return {
+            "ttl_s":          self.ttl_s,
+            "memory_entries": len(self._memory),
+            **self._counts,
+            "hit_rate":       round(hits / lookups, 3) if lookups else None,
+        }
+
+
+_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Process-wide cache, created on first use."""
+    global _cache
+    if _cache is None:
+        _cache = LLMCache()
+    return _cache
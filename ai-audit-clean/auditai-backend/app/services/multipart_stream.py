@@ -0,0 +1,161 @@
+"""
+multipart_stream.py — reads a file out of a multipart/form-data request as it arrives.
+
+Starlette's form parser spools every file part to a temporary file before
+the endpoint runs, which then had to be read back and copied again to hash
+and store it. Here the request body is read once: the file part's bytes go
+to a sink (storage.BlobWriter, which hashes and spools them) as they are
+received. Parsing and writing run in a worker thread, RECEIVE_BUFFER_BYTES
+at a time, while the next buffer is received on the event loop.
+
+The parser is a small one of our own: python-multipart's works a byte at a
+time in Python (~60 MB/s), which capped upload throughput.
+"""
+import asyncio
+from typing import Callable, Optional, Protocol
+from multipart.multipart import parse_options_header
+from starlette.requests import Request
+
+RECEIVE_BUFFER_BYTES = 1024 * 1024
+MAX_HEADER_BYTES     = 16 * 1024
+
+
+class InvalidUpload(ValueError):
+    """The request isn't a multipart upload of an acceptable file."""
+
+
+class Sink(Protocol):
+    def write(self, chunk: bytes) -> None: ...
+    def abort(self) -> None: ...
+
+
+class _FilePart:
+    """
+    Incremental multipart/form-data parser that routes one file field's data
+    to a sink. Part bodies are scanned for the boundary with bytes.find, so
+    file data passes through at memory speed; the rest of the form is
+    skipped.
+    """
+
+    def __init__(self, boundary: bytes, field: str, open_sink: Callable[[str], Sink]):
+        self.delimiter = b"\r\n--" + boundary
+        self.field     = field.encode()
+        self.open_sink = open_sink
+        self.filename: Optional[str] = None
+        self.sink: Optional[Sink]    = None
+        self.active   = False
+        self.state    = "preamble"
+        self.buffer   = b"\r\n"   # lets the first boundary match the delimiter
+
+    def write(self, data: bytes) -> None:
+        self.buffer = self.buffer + data if self.buffer else bytes(data)
+        while self._step():
+            pass
+
+    def finalize(self) -> None:
+        if self.state != "end":
+            raise InvalidUpload("Upload ended before the multipart body was complete")
+
+    def _step(self) -> bool:
+        """Consume what the current state can from the buffer; False when more data is needed."""
+        buf = self.buffer
+        if self.state in ("preamble", "data"):
+            at = buf.find(self.delimiter)
+            if at < 0:
+                keep = len(self.delimiter) - 1   # a delimiter may straddle two writes
+                if len(buf) > keep:
+                    self._data(memoryview(buf)[:len(buf) - keep])
+                    self.buffer = buf[len(buf) - keep:]
+                return False
+            self._data(memoryview(buf)[:at])
+            if self.state == "data":
+                self._part_end()
+            self.buffer = buf[at + len(self.delimiter):]
+            self.state  = "delimiter"
+            return True
+
+        if self.state == "delimiter":
+            if len(buf) < 2:
+                return False
+            if buf[:2] == b"--":
+                self.state, self.buffer = "end", b""
+                return False
+            line_end = buf.find(b"\r\n")
+            if line_end < 0:
+                return False
+            if buf[:line_end].strip(b" \t"):   # only transport padding may follow a boundary
+                raise InvalidUpload("Malformed multipart body")
+            self.buffer = buf[line_end + 2:]
+            self.state  = "headers"
+            return True
+
+        if self.state == "headers":
+            at = buf.find(b"\r\n\r\n")
+            if at < 0:
+                if len(buf) > MAX_HEADER_BYTES:
+                    raise InvalidUpload("Multipart part headers are too large")
+                return False
+            self._part_begin(buf[:at])
+            self.buffer = buf[at + 4:]
+            self.state  = "data"
+            return True
+
+        self.buffer = b""   # epilogue after the closing boundary
+        return False
+
+    def _part_begin(self, raw_headers: bytes) -> None:
+        headers = {}
+        for line in raw_headers.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            headers[name.strip().lower()] = value.strip()
+        _, options = parse_options_header(headers.get(b"content-disposition", b""))
+        name, filename = options.get(b"name"), options.get(b"filename")
+        if self.sink is None and filename is not None and name == self.field:
+            self.filename = filename.decode("utf-8", "replace")
+            self.sink     = self.open_sink(self.filename)   # may raise InvalidUpload
+            self.active   = True
+
+    def _data(self, data: memoryview) -> None:
+        if self.active and len(data):
+            self.sink.write(data)
+
+    def _part_end(self) -> None:
+        self.active = False
+
+
+async def receive_file(request: Request, field: str, open_sink: Callable[[str], Sink]) -> tuple[str, Sink]:
+    """
+    Stream the file in form field `field` into open_sink(filename). Returns
+    the filename and the sink, with all data written to it. Raises
+    InvalidUpload if the body isn't multipart or has no such file; on any
+    error the sink is aborted.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise InvalidUpload("Expected a multipart/form-data upload")
+
+    part    = _FilePart(params[b"boundary"], field, open_sink)
+    buffer  = bytearray()
+    pending: Optional[asyncio.Future] = None
+    try:
+        async for chunk in request.stream():
+            buffer += chunk
+            if len(buffer) >= RECEIVE_BUFFER_BYTES:
+                if pending:
+                    await pending
+                data, buffer = buffer, bytearray()
+                pending = asyncio.ensure_future(asyncio.to_thread(part.write, data))
+        if pending:
+            await pending
+            pending = None
+        await asyncio.to_thread(part.write, buffer)
+        part.finalize()
+        if part.sink is None:
+            raise InvalidUpload(f"No file in form field '{field}'")
+    except BaseException:
+        if pending:
+            await asyncio.wait([pending])   # let the write in flight finish before aborting
+        if part.sink is not None:
+            part.sink.abort()
+        raise
+    return part.filename, part.sink
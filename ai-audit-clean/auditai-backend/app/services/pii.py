@@ -0,0 +1,167 @@
+"""
+pii.py — compiled multi-pattern PII scanner used by the data leakage metric.
+
+All patterns are compiled once per process. A batch of texts is joined into a
+single NUL-separated buffer and scanned as one string, so the per-row Python
+overhead is paid only for rows that can contain PII:
+
+  1. Cheap prefilters (literal substrings, a single digit) select candidate
+     rows for each group of patterns.
+  2. The group's patterns, combined into one regex, run over the candidates.
+  3. Per-pattern hit counts are computed over the flagged rows alone.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Iterable, Optional
+from app.core.config import settings
+
+
+PII_PATTERNS = {
+    "email":       r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+    "phone":       r"\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b",                       # US phone
+    "card":        r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b",                 # credit card
+    "ssn":         r"\b\d{3}-\d{2}-\d{4}\b",
+    "ip":          r"\b(?:\d{1,3}\.){3}\d{1,3}\b",
+    "ni":          r"\b[A-Z]{2}\d{6}[A-Z]\b",                                   # UK NI number
+    "credentials": r"\b(password|passwd|secret|api_key|api-key|token)\s*[:=]\s*\S+",
+}
+
+# Every match of a grouped pattern contains one of these, so rows without any
+# of them are skipped before the full patterns run.
+PII_PREFILTERS = [
+    (["@"],                                           ["email"]),
+    ([r"\d"],                                         ["phone", "card", "ssn", "ip", "ni"]),
+    (["passw", "secret", "api_key", "api-key", "token"], ["credentials"]),
+]
+
+_SEP = "\x00"
+
+
+@dataclass
+class PIIScanResult:
+    """Rows scanned, rows with any PII, and rows matching each pattern."""
+    rows:    int = 0
+    flagged: int = 0
+    hits:    dict[str, int] = field(default_factory=lambda: {name: 0 for name in PII_PATTERNS})
+
+    @property
+    def rate(self) -> float:
+        return self.flagged / max(self.rows, 1)
+
+    def merge(self, other: "PIIScanResult") -> "PIIScanResult":
+        """Add another result's counts into this one."""
+        self.rows    += other.rows
+        self.flagged += other.flagged
+        for name, count in other.hits.items():
+            self.hits[name] = self.hits.get(name, 0) + count
+        return self
+
+
+class _PatternGroup:
+    def __init__(self, prefilters: list[str], patterns: dict[str, str]):
+        self.prefilters = [re.compile(p) for p in prefilters]
+        self.patterns   = {name: re.compile(p) for name, p in patterns.items()}
+        self.combined   = re.compile("|".join(f"(?:{p})" for p in patterns.values()))
+
+    def candidates(self, texts: list[str]) -> list[int]:
+        if not self.prefilters:
+            return list(range(len(texts)))
+        if len(self.prefilters) == 1:
+            return _matching_rows(self.prefilters[0], texts)
+        return sorted(set().union(*(_matching_rows(p, texts) for p in self.prefilters)))
+
+
+class PIIScanner:
+    def __init__(self, patterns: dict[str, str] = PII_PATTERNS, batch_size: Optional[int] = None):
+        self.names      = list(patterns)
+        self.groups     = []
+        self.batch_size = batch_size or settings.PII_SCAN_BATCH_SIZE
+
+        remaining = dict(patterns)
+        for prefilters, names in PII_PREFILTERS:
+            grouped = {n: remaining.pop(n) for n in names if n in remaining}
+            if grouped:
+                self.groups.append(_PatternGroup(prefilters, grouped))
+        if remaining:
+            self.groups.append(_PatternGroup([], remaining))
+
+    def scan(self, texts: Iterable[str]) -> PIIScanResult:
+        """Scan texts in batches; each text counts once however many patterns match."""
+        result = PIIScanResult(hits={name: 0 for name in self.names})
+        batch: list[str] = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) >= self.batch_size:
+                self._scan_batch(batch, result)
+                batch = []
+        if batch:
+            self._scan_batch(batch, result)
+        return result
+
+    def _scan_batch(self, texts: list[str], result: PIIScanResult) -> None:
+        flagged: set[int] = set()
+        for group in self.groups:
+            rows = group.candidates(texts)
+            candidates = [texts[i] for i in rows]
+            group_rows = _matching_rows(group.combined, candidates)
+            if not group_rows:
+                continue
+            flagged.update(rows[i] for i in group_rows)
+
+            matched = [candidates[i] for i in group_rows]
+            for name, pattern in group.patterns.items():
+                if len(group.patterns) == 1:
+                    result.hits[name] += len(group_rows)
+                else:
+                    result.hits[name] += len(_matching_rows(pattern, matched))
+
+        result.rows    += len(texts)
+        result.flagged += len(flagged)
+
+
+def _matching_rows(pattern: re.Pattern, texts: list[str]) -> list[int]:
+    """
+    Indices of texts in which pattern.search() finds a match.
+
+    The texts are scanned as one NUL-joined buffer. After a hit the scan
+    resumes at the start of the next row, so each row costs at most one
+    Python-level iteration. A match that runs across a separator is
+    re-checked against its own row, keeping results identical to calling
+    pattern.search() on every text individually.
+    """
+    if not texts:
+        return []
+
+    blob   = _SEP.join(texts)
+    starts = [0, *accumulate(len(t) + 1 for t in texts)]   # starts[-1] is past the end
+    rows   = []
+    pos    = 0
+    while True:
+        m = pattern.search(blob, pos)
+        if m is None:
+            break
+        row = bisect_right(starts, m.start()) - 1
+        if _SEP not in m.group(0) or pattern.search(texts[row]):
+            rows.append(row)
+        if row + 1 >= len(texts):
+            break
+        pos = starts[row + 1]
+    return rows
+
+
+_scanner: Optional[PIIScanner] = None
+
+
+def get_pii_scanner() -> PIIScanner:
+    """Process-wide scanner, compiled on first use."""
+    global _scanner
+    if _scanner is None:
+        _scanner = PIIScanner()
+    return _scanner
+
+
+def scan_pii(texts: Iterable[str]) -> PIIScanResult:
+    return get_pii_scanner().scan(texts)
@@ -0,0 +1,301 @@
+"""
+report_jobs.py — runs report generation in the background for
+POST /reports/generate?mode=job.
+
+A job is a ReportJob row: the request as submitted, its status
+(queued → running → succeeded | failed), the pipeline stage it has reached
+and, once done, the report id or the error. Each server process runs up to
+REPORT_JOB_WORKERS jobs at once as tasks on its event loop. Scoring still
+goes to the scoring executor and the Claude call is network I/O, so a job
+spends most of its time waiting.
+
+Job state lives in the database, so jobs outlive the process that accepted
+them:
+- A job is claimed with a conditional UPDATE, so only one process runs it.
+- A running job refreshes heartbeat_at while it works.
+- At startup, and every REPORT_JOB_SWEEP_S seconds after that, each process
+  takes queued jobs that nobody picked up. It also re-queues running jobs
+  whose heartbeat went stale, which means their process died.
+- A job whose runs were interrupted REPORT_JOB_MAX_ATTEMPTS times is failed
+  instead of re-queued.
+- On a clean shutdown, running jobs go straight back to queued.
+- The report row and the job's success are committed together, so a
+  re-run job never leaves a duplicate report behind.
+"""
+import asyncio
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Iterator, Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.read_routing import acting_for
+from app.models.orm import ReportJob
+from app.models.schemas import ReportRequest
+from app.services.executor import ScoringQueueFull, ScoringUnavailable
+from app.services.report_service import prepare_report
+
+logger = logging.getLogger(__name__)
+
+FINISHED           = ("succeeded", "failed")
+QUEUE_FULL_RETRY_S = 5     # wait before retrying a job the scoring queue turned away
+FOLLOW_POLL_S      = 2.0   # follow() re-reads the row this often, for jobs running in another process
+
+
+class ReportJobRunner:
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = settings.REPORT_JOB_WORKERS if workers is None else workers
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: set[str] = set()   # ids in the local queue, so sweeps don't add them twice
+        self._tasks:  list[asyncio.Task] = []
+        self._watchers: dict[str, set[asyncio.Event]] = {}
+        self._running = 0
+        self._counts  = {"succeeded": 0, "failed": 0, "requeued": 0}
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the workers and the sweeper on the running event loop."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweeper()))
+        logger.info(f"Report job runner started: {self.workers} workers")
+
+    async def shutdown(self) -> None:
+        """Stop the workers; the jobs they were running go back to queued."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks, self._queue = [], None
+        self._queued.clear()
+        logger.info("Report job runner stopped")
+
+    # ── Jobs ──────────────────────────────────────────────────────────────────
+
+    async def submit(self, db: AsyncSession, user_id: str, body: ReportRequest) -> ReportJob:
+        """Store a job for the request and queue it here; returns the saved row."""
+        job = ReportJob(user_id=user_id, request=body.model_dump())
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        self._enqueue(job.id)   # if this process is stopping, a sweep elsewhere takes it
+        return job
+
+    async def follow(self, job_id: str) -> AsyncIterator[Optional[ReportJob]]:
+        """
+        Yield the job each time it changes, starting with its current state,
+        until it has finished. Yields None every FOLLOW_POLL_S while nothing
+        changes. Changes made in this process are seen at once. Changes made
+        by another process are seen at the next poll.
+        """
+        last = None
+        with self._watch(job_id) as changed:
+            while True:
+                changed.clear()
+                async with AsyncSessionLocal() as db:
+                    job = await db.get(ReportJob, job_id)
+                if job is None:
+                    return
+                state = (job.status, job.stage, job.attempts)
+                yield job if state != last else None
+                last = state
+                if job.status in FINISHED:
+                    return
+                try:
+                    await asyncio.wait_for(changed.wait(), FOLLOW_POLL_S)
+                except asyncio.TimeoutError:
+                    pass
+
+    def _enqueue(self, job_id: str) -> None:
+        if self._queue is not None and job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"Report job {job_id} could not be run: {e}")
+
+    async def _run(self, job_id: str) -> None:
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            claimed = await db.execute(
+                update(ReportJob)
+                .where(ReportJob.id == job_id, ReportJob.status == "queued")
+                .values(status="running", stage=None, error=None, started_at=now,
+                        heartbeat_at=now, attempts=ReportJob.attempts + 1)
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                return   # another worker or process got there first
+            job = await db.get(ReportJob, job_id)
+            run = (job_id, job.attempts)   # rollback expires `job`, so later updates use these
+            self._notify(job_id)
+            logger.info(f"Report job {job_id} started (attempt {job.attempts})")
+
+            self._running += 1
+            heartbeat = asyncio.create_task(self._heartbeat(run))
+            try:
+                with acting_for(job.user_id):   # its report makes the user's reads sticky to the primary
+                    await asyncio.wait_for(self._generate(db, job, run), settings.REPORT_JOB_TIMEOUT_S)
+            except asyncio.CancelledError:
+                await db.rollback()
+                await self._set(run, status="queued", stage=None)
+                self._counts["requeued"] += 1
+                raise
+            except Exception as e:
+                await db.rollback()
+                error = (
+                    f"Report job did not finish within {settings.REPORT_JOB_TIMEOUT_S}s"
+                    if isinstance(e, asyncio.TimeoutError) else str(e) or type(e).__name__
+                )
+                logger.error(f"Report job {job_id} failed: {error}")
+                await self._set(run, status="failed", stage=None, error=error, finished_at=datetime.utcnow())
+                self._counts["failed"] += 1
+            finally:
+                heartbeat.cancel()
+                self._running -= 1
+
+    async def _generate(self, db: AsyncSession, job: ReportJob, run: tuple[str, int]) -> None:
+        async def on_stage(stage: str) -> None:
+            await self._set(run, stage=stage)
+
+        body = ReportRequest(**job.request)
+        while True:
+            try:
+                report = await prepare_report(db, job.user_id, body, on_stage)
+                break
+            except (ScoringQueueFull, ScoringUnavailable):
+                await self._set(run, stage="waiting for scoring")
+                await asyncio.sleep(QUEUE_FULL_RETRY_S)
+
+        await self._set(run, stage="saving")
+        db.add(report)
+        await db.flush()
+        # Same transaction as the report; matches nothing if a sweep re-queued this run meanwhile
+        done = await db.execute(
+            self._this_run(run).values(
+                status="succeeded", stage=None, report_id=report.id, finished_at=datetime.utcnow()
+            )
+        )
+        if done.rowcount != 1:
+            await db.rollback()
+            logger.warning(f"Report job {run[0]} was taken over by another run; its report is discarded")
+            return
+        await db.commit()
+        self._counts["succeeded"] += 1
+        self._notify(run[0])
+        logger.info(f"Report job {run[0]} succeeded: report {report.id}")
+
+    async def _heartbeat(self, run: tuple[str, int]) -> None:
+        while True:
+            await asyncio.sleep(settings.REPORT_JOB_SWEEP_S / 3)
+            try:
+                await self._set(run, heartbeat_at=datetime.utcnow())
+            except Exception as e:
+                logger.warning(f"Report job {run[0]} heartbeat failed: {e}")
+
+    def _this_run(self, run: tuple[str, int]):
+        """UPDATE of the job row that only matches while this run (id, attempt) still owns it."""
+        job_id, attempt = run
+        return update(ReportJob).where(
+            ReportJob.id == job_id, ReportJob.status == "running", ReportJob.attempts == attempt
+        )
+
+    async def _set(self, run: tuple[str, int], **values) -> None:
+        """Update this run's job row in a session of its own, and wake anyone following it."""
+        async with AsyncSessionLocal() as db:
+            await db.execute(self._this_run(run).values(**values))
+            await db.commit()
+        self._notify(run[0])
+
+    # ── Sweeps ────────────────────────────────────────────────────────────────
+
+    async def _sweeper(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Report job sweep failed: {e}")
+            await asyncio.sleep(settings.REPORT_JOB_SWEEP_S)
+
+    async def sweep(self) -> None:
+        """Re-queue jobs from dead processes, drop old finished ones, and queue what's waiting."""
+        now   = datetime.utcnow()
+        stale = ReportJob.heartbeat_at < now - timedelta(seconds=2 * settings.REPORT_JOB_SWEEP_S)
+        async with AsyncSessionLocal() as db:
+            failed = await db.execute(
+                update(ReportJob)
+                .where(ReportJob.status == "running", stale, ReportJob.attempts >= settings.REPORT_JOB_MAX_ATTEMPTS)
+                .values(status="failed", stage=None, finished_at=now,
+                        error=f"Interrupted {settings.REPORT_JOB_MAX_ATTEMPTS} times, giving up")
+            )
+            requeued = await db.execute(
+                update(ReportJob).where(ReportJob.status == "running", stale).values(status="queued", stage=None)
+            )
+            if settings.REPORT_JOB_RETENTION_H > 0:
+                await db.execute(
+                    delete(ReportJob).where(
+                        ReportJob.status.in_(FINISHED),
+                        ReportJob.finished_at < now - timedelta(hours=settings.REPORT_JOB_RETENTION_H),
+                    )
+                )
+            waiting = await db.execute(
+                select(ReportJob.id).where(ReportJob.status == "queued").order_by(ReportJob.created_at)
+            )
+            job_ids = waiting.scalars().all()
+            await db.commit()
+
+        if failed.rowcount or requeued.rowcount:
+            logger.warning(f"Report jobs interrupted: {requeued.rowcount} re-queued, {failed.rowcount} failed")
+        for job_id in job_ids:
+            self._enqueue(job_id)
+
+    # ── Notifications ─────────────────────────────────────────────────────────
+
+    @contextmanager
+    def _watch(self, job_id: str) -> Iterator[asyncio.Event]:
+        event = asyncio.Event()
+        self._watchers.setdefault(job_id, set()).add(event)
+        try:
+            yield event
+        finally:
+            watchers = self._watchers.get(job_id, set())
+            watchers.discard(event)
+            if not watchers:
+                self._watchers.pop(job_id, None)
+
+    def _notify(self, job_id: str) -> None:
+        for event in self._watchers.get(job_id, ()):
+            event.set()
+
+    # ── Stats ─────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "queued":  len(self._queued),
+            **self._counts,
+        }
+
+
+_runner: Optional[ReportJobRunner] = None
+
+
+def get_report_job_runner() -> ReportJobRunner:
+    """Process-wide runner, created on first use."""
+    global _runner
+    if _runner is None:
+        _runner = ReportJobRunner()
+    return _runner
@@ -0,0 +1,277 @@
+"""
+report_service.py — the report generation pipeline behind POST /reports/generate,
+its streaming variant and report jobs: scores (from an upload or the request)
+→ Claude analysis → build_report → an unsaved Report row.
+"""
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.orm import Blob, Report, Upload
+from app.models.schemas import ReportRequest
+from app.services.claude_service import generate_ai_analysis
+from app.services.columnar import ColumnarCopyUnusable
+from app.services.executor import ScoringQueueFull, ScoringTimeout, ScoringUnavailable, get_scoring_executor
+from app.services.ingest import score_columnar, score_path
+from app.services.report_builder import build_report, risk_level
+from app.services.scoring import SCORING_ENGINE_VERSION
+from app.services.storage import load_file_path, release_file_path
+
+logger = logging.getLogger(__name__)
+
+BATCH_QUEUE_FULL_RETRIES = 4   # tries per re-score when other traffic has filled the scoring queue
+
+
+class UploadNotFound(LookupError):
+    """The request names an upload that doesn't exist or isn't the user's."""
+
+
+class RescoreFailed(Exception):
+    """Scoring an upload's stored file failed."""
+
+
+async def prepare_report(
+    db: AsyncSession,
+    user_id: str,
+    body: ReportRequest,
+    on_stage: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> Report:
+    """
+    Run the pipeline for one request and return the Report, not yet added to
+    the session. on_stage is awaited with "scoring", "analysis" and
+    "building" as each step starts. Raises UploadNotFound, RescoreFailed,
+    ScoringQueueFull, ScoringUnavailable or ScoringTimeout.
+    """
+    async def stage(name: str) -> None:
+        if on_stage is not None:
+            await on_stage(name)
+
+    # ── Get scores from upload or manual input ────────────────────────────────
+    await stage("scoring")
+    scores, row_count = await resolve_scores(db, user_id, body)
+
+    # ── Claude AI analysis ────────────────────────────────────────────────────
+    await stage("analysis")
+    info = system_info(body)
+    ai_analysis = await generate_ai_analysis(scores, info)
+
+    # ── Build full report ─────────────────────────────────────────────────────
+    await stage("building")
+    return report_row(user_id, body, scores, build_report(scores, info, ai_analysis, row_count))
+
+
+async def stream_report(db: AsyncSession, user_id: str, body: ReportRequest) -> AsyncIterator[tuple[str, Any]]:
+    """
+    The pipeline as it happens, as (event, data) pairs:
+      scores          {"scores", "row_count"}, as soon as they are known
+      report          build_report output without ai_analysis; everything rule-based
+      analysis_delta  {"text"}, the Claude answer as it streams in
+      analysis        the parsed analysis (or the rule-based fallback)
+      built           the finished Report, not yet added to the session
+    Raises what prepare_report raises.
+    """
+    scores, row_count = await resolve_scores(db, user_id, body)
+    yield "scores", {"scores": scores, "row_count": row_count}
+
+    info = system_info(body)
+    yield "report", build_report(scores, info, None, row_count)
+
+    deltas: asyncio.Queue = asyncio.Queue()
+    analysis = asyncio.create_task(generate_ai_analysis(scores, info, on_text=deltas.put))
+    analysis.add_done_callback(lambda _: deltas.put_nowait(None))
+    try:
+        while (text := await deltas.get()) is not None:
+            yield "analysis_delta", {"text": text}
+        ai_analysis = await analysis
+    finally:
+        analysis.cancel()   # no-op once done; stops the Claude call if the client went away
+    yield "analysis", ai_analysis
+
+    yield "built", report_row(user_id, body, scores, build_report(scores, info, ai_analysis, row_count))
+
+
+async def prepare_reports(db: AsyncSession, user_id: str, bodies: list[ReportRequest]) -> list:
+    """
+    prepare_report for many requests at once. Returns one entry per request,
+    in order: the Report (not yet added to the session) or the exception that
+    request failed with. One failure doesn't stop the others.
+
+    Every named upload is loaded in one query. Each stale upload is re-scored
+    once however many requests name it, with at most one re-score per scoring
+    worker in flight. Analyses all run together; generate_ai_analysis keeps
+    Claude calls within LLM_MAX_CONCURRENCY, and requests with identical
+    prompts share one call.
+    """
+    # ── Scores: one query, one re-score per stale upload ──────────────────────
+    upload_ids = {body.upload_id for body in bodies if body.upload_id}
+    uploads = {}
+    if upload_ids:
+        result = await db.execute(select(Upload).where(Upload.id.in_(upload_ids), Upload.user_id == user_id))
+        uploads = {upload.id: upload for upload in result.scalars()}
+    stale = [u for u in uploads.values() if not (u.scores and u.engine_version == SCORING_ENGINE_VERSION)]
+    blob_ids = {u.blob_id for u in stale if u.blob_id}
+    blobs = {}
+    if blob_ids:
+        result = await db.execute(select(Blob).where(Blob.id.in_(blob_ids)))
+        blobs = {blob.id: blob for blob in result.scalars()}
+
+    slots = asyncio.Semaphore(max(get_scoring_executor().workers, 1))
+
+    async def rescore(upload: Upload) -> tuple[dict, int]:
+        async with slots:
+            for attempt in range(BATCH_QUEUE_FULL_RETRIES):
+                try:
+                    return await _rescore(upload, blobs.get(upload.blob_id))
+                except (ScoringQueueFull, ScoringUnavailable):
+                    if attempt == BATCH_QUEUE_FULL_RETRIES - 1:
+                        raise
+                    await asyncio.sleep(1 + attempt)   # other traffic has the queue, or workers restart; back off
+
+    rescored = dict(zip(
+        (u.id for u in stale),
+        await asyncio.gather(*(rescore(u) for u in stale), return_exceptions=True),
+    ))
+
+    def scores_for(body: ReportRequest) -> tuple[dict, int]:
+        if not body.upload_id:
+            return manual_scores(body), 0
+        upload = uploads.get(body.upload_id)
+        if upload is None:
+            raise UploadNotFound("Upload not found")
+        if upload.id not in rescored:
+            return upload.scores, upload.row_count
+        outcome = rescored[upload.id]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    # ── Analyses and reports ──────────────────────────────────────────────────
+    async def build(body: ReportRequest) -> Report:
+        scores, row_count = scores_for(body)
+        info = system_info(body)
+        ai_analysis = await generate_ai_analysis(scores, info)
+        return report_row(user_id, body, scores, build_report(scores, info, ai_analysis, row_count))
+
+    return await asyncio.gather(*(build(body) for body in bodies), return_exceptions=True)
+
+
+def system_info(body: ReportRequest) -> dict:
+    return {
+        "model_name":      body.model_name,
+        "model_version":   body.model_version,
+        "org_name":        body.org_name,
+        "use_case":        body.use_case,
+        "deploy_env":      body.deploy_env,
+        "training_data":   body.training_data,
+        "oversight_policy": body.oversight_policy,
+        "incident_policy": body.incident_policy,
+        "framework":       body.framework,
+    }
+
+
+def report_row(user_id: str, body: ReportRequest, scores: dict, full_report: dict) -> Report:
+    avg_score   = sum(scores.values()) / len(scores)
+    overall     = risk_level(avg_score)
+    readiness   = round((1 - avg_score) * 100)
+
+    return Report(
+        user_id=user_id,
+        model_name=body.model_name,
+        model_version=body.model_version,
+        org_name=body.org_name,
+        use_case=body.use_case,
+        deploy_env=body.deploy_env,
+        framework=body.framework,
+        bias_score=scores["bias"],
+        hallucination_score=scores["hallucination"],
+        toxicity_score=scores["toxicity"],
+        robustness_score=scores["robustness"],
+        explainability_score=scores["explainability"],
+        data_leakage_score=scores["data_leakage"],
+        drift_score=scores["drift"],
+        overall_risk=overall,
+        readiness_pct=readiness,
+        full_report=full_report,
+    )
+
+
+def manual_scores(body: ReportRequest) -> dict:
+    return {
+        "bias":           body.bias_score          or 0.3,
+        "hallucination":  body.hallucination_score or 0.3,
+        "toxicity":       body.toxicity_score      or 0.1,
+        "robustness":     body.robustness_score    or 0.3,
+        "explainability": body.explainability_score or 0.4,
+        "data_leakage":   body.data_leakage_score  or 0.2,
+        "drift":          body.drift_score         or 0.25,
+    }
+
+
+async def resolve_scores(db: AsyncSession, user_id: str, body: ReportRequest) -> tuple[dict, int]:
+    """
+    Scores and row count for a request: an upload's stored scores (re-scored
+    if an older engine computed them), or the manual scores in the request.
+    """
+    if not body.upload_id:
+        return manual_scores(body), 0
+
+    result = await db.execute(
+        select(Upload).where(Upload.id == body.upload_id, Upload.user_id == user_id)
+    )
+    upload = result.scalar_one_or_none()
+    if not upload:
+        raise UploadNotFound("Upload not found")
+
+    if upload.scores and upload.engine_version == SCORING_ENGINE_VERSION:
+        # Reuse the scores computed at upload time
+        return upload.scores, upload.row_count
+    # Scored by an older engine — re-run scoring from the stored file
+    return await rescore_upload(db, upload)
+
+
+async def rescore_upload(db: AsyncSession, upload: Upload) -> tuple[dict, int]:
+    """
+    Score an upload's stored file on the scoring executor and store the result
+    on it and its blob. Reads the blob's columnar copy when there is one.
+    """
+    blob = await db.get(Blob, upload.blob_id) if upload.blob_id else None
+    return await _rescore(upload, blob)
+
+
+async def _rescore(upload: Upload, blob: Optional[Blob]) -> tuple[dict, int]:
+    """rescore_upload with the blob already loaded; touches no session, so batches can run several at once."""
+    logger.info(f"Re-scoring upload {upload.id} (engine {upload.engine_version or 'none'})")
+    try:
+        result = None
+        if blob and blob.columnar_path:
+            try:
+                result = await get_scoring_executor().run(score_columnar, blob.columnar_path, blob.ext)
+            except (FileNotFoundError, ImportError, ColumnarCopyUnusable) as e:
+                logger.warning(f"Columnar copy unusable, re-parsing the raw file: {e}")
+                blob.columnar_path = None
+        if result is None:
+            # An S3 download: off the event loop, which batches share between several re-scores
+            file_path = await asyncio.to_thread(load_file_path, upload.storage_path)
+            try:
+                ext = upload.filename.lower().split(".")[-1]
+                result = await get_scoring_executor().run(score_path, file_path, ext)
+            finally:
+                await asyncio.to_thread(release_file_path, upload.storage_path, file_path)
+    except (ScoringQueueFull, ScoringUnavailable, ScoringTimeout):
+        raise
+    except Exception as e:
+        logger.error(f"Failed to re-score from file: {e}")
+        raise RescoreFailed(f"Failed to process uploaded file: {str(e)}")
+    if not result["scores"]:
+        raise RescoreFailed("Uploaded file contains no data rows")
+
+    for target in (upload, blob):
+        if target is None:
+            continue
+        target.scores         = result["scores"]
+        target.column_map     = result["column_map"]
+        target.engine_version = result["engine_version"]
+        target.row_count      = result["row_count"]
+    return result["scores"], result["row_count"]
@@ -1,67 +1,178 @@
 """
 storage.py — handles file saving and retrieval.
 Local by default, swap to S3 for production.
+
+Uploads are content-addressed: the file is hashed (SHA-256) as it is
+received and spooled to a local temporary file (BlobWriter), then stored
+under blobs/<hash[:2]>/<hash><ext>. Identical content is stored once,
+however often and by whoever it is uploaded.
+
+With S3 the local copy is kept until the upload has been scored, so scoring
+reads it from local disk while persist_blob sends it to S3.
 """
 import os
-import uuid
-import shutil
+import hashlib
 import logging
+import tempfile
 from pathlib import Path
-from fastapi import UploadFile
+from typing import NamedTuple
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class StoredBlob(NamedTuple):
+    content_hash: str
+    storage_path: str    # local path or S3 key
+    size_bytes:   int
+    created:      bool   # False when identical content was already stored
+    local_path:   str    # local copy to read the content from
+
+
 def _local_dir() -> Path:
     path = Path(settings.STORAGE_LOCAL_DIR)
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
-async def save_upload(file: UploadFile, user_id: str) -> tuple[str, str]:
+def blob_key(content_hash: str, ext: str) -> str:
+    return f"blobs/{content_hash[:2]}/{content_hash}{ext}"
+
+
+def columnar_path(content_hash: str, ext: str) -> str:
+    """Local path for a blob's Parquet copy. Kept on local disk for every backend — it is a read cache."""
+    return str(_local_dir() / "columnar" / content_hash[:2] / f"{content_hash}.{ext.lstrip('.')}.parquet")
+
+
+class BlobWriter:
     """
-    Save uploaded file. Returns (storage_path, original_filename).
-    storage_path is local path or S3 key.
+    Hashes and spools an upload chunk by chunk as it is received; close()
+    then stores it under its content address. Writes are blocking — call
+    them from a worker thread.
     """
-    ext = Path(file.filename).suffix.lower()
-    safe_name = f"{user_id}/{uuid.uuid4()}{ext}"
 
-    if settings.STORAGE_BACKEND == "s3":
-        return await _save_s3(file, safe_name), file.filename
-    else:
-        return await _save_local(file, safe_name), file.filename
+    def __init__(self, ext: str):
+        tmp_dir = _local_dir() / "tmp"
+        tmp_dir.mkdir(exist_ok=True)
+        self.ext    = ext
+        self.tmp    = tempfile.NamedTemporaryFile(dir=tmp_dir, suffix=ext, delete=False)
+        self.digest = hashlib.sha256()
+        self.size   = 0
+
+    def write(self, chunk: bytes) -> None:
+        self.digest.update(chunk)
+        self.tmp.write(chunk)
+        self.size += len(chunk)
+
+    def abort(self) -> None:
+        self.tmp.close()
+        Path(self.tmp.name).unlink(missing_ok=True)
+
+    def close(self) -> StoredBlob:
+        """Store the content, reusing an identical stored copy."""
+        self.tmp.close()
+        content_hash = self.digest.hexdigest()
+        key = blob_key(content_hash, self.ext)
+        try:
+            if settings.STORAGE_BACKEND == "s3":
+                storage_path, created, local_path = key, not _s3_exists(key), self.tmp.name
+            else:
+                storage_path, created = _store_local(self.tmp.name, key)
+                local_path = storage_path
+        except Exception:
+            self.abort()
+            raise
+        if local_path != self.tmp.name:
+            Path(self.tmp.name).unlink(missing_ok=True)
+
+        logger.info(f"{'Stored' if created else 'Reused'} blob {content_hash[:12]} ({self.size} bytes) at {storage_path}")
+        return StoredBlob(content_hash, storage_path, self.size, created, local_path)
+
+
+def persist_blob(stored: StoredBlob) -> None:
+    """Send a new blob to S3 from its local copy. Local blobs are stored by BlobWriter.close()."""
+    if settings.STORAGE_BACKEND == "s3" and stored.created:
+        _upload_s3(stored.local_path, stored.storage_path)
+
+
+def release_blob(stored: StoredBlob) -> None:
+    """Drop the local copy of an S3 blob once it has been persisted and scored."""
+    if stored.local_path != stored.storage_path:
+        Path(stored.local_path).unlink(missing_ok=True)
 
 
-async def _save_local(file: UploadFile, key: str) -> str:
+def _store_local(tmp_path: str, key: str) -> tuple[str, bool]:
+    """
+    Link the spooled file in at its content address. The link is atomic and
+    fails if the address is taken, so of two concurrent uploads of new content
+    exactly one is its creator; readers never see a partial blob.
+    """
     dest = _local_dir() / key
     dest.parent.mkdir(parents=True, exist_ok=True)
-    with open(dest, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-    logger.info(f"Saved file locally: {dest}")
-    return str(dest)
+    try:
+        os.link(tmp_path, dest)
+    except FileExistsError:
+        return str(dest), False
+    return str(dest), True
+
+
+def _s3_exists(key: str) -> bool:
+    s3 = _s3_client()
+    try:
+        s3.head_object(Bucket=settings.AWS_BUCKET, Key=key)
+        return True
+    except s3.exceptions.ClientError as e:
+        if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+            raise
+        return False
 
 
-async def _save_s3(file: UploadFile, key: str) -> str:
+def _upload_s3(tmp_path: str, key: str) -> None:
     """Upload to S3-compatible storage (AWS S3 / Cloudflare R2 / Supabase Storage)."""
     try:
-        import boto3
-        s3 = boto3.client("s3", region_name=settings.AWS_REGION)
-        s3.upload_fileobj(file.file, settings.AWS_BUCKET, key)
+        _s3_client().upload_file(tmp_path, settings.AWS_BUCKET, key)
         logger.info(f"Saved file to S3: s3://{settings.AWS_BUCKET}/{key}")
-        return key
     except Exception as e:
         logger.error(f"S3 upload failed: {e}")
         raise
 
 
+def _s3_client():
+    import boto3
+    return boto3.client("s3", region_name=settings.AWS_REGION, endpoint_url=settings.AWS_ENDPOINT_URL or None)
+
+
+def delete_upload(storage_path: str) -> None:
+    """Remove a stored file, e.g. when it turns out not to be scoreable."""
+    try:
+        if settings.STORAGE_BACKEND == "s3":
+            _s3_client().delete_object(Bucket=settings.AWS_BUCKET, Key=storage_path)
+        else:
+            Path(storage_path).unlink(missing_ok=True)
+    except Exception as e:
+        logger.warning(f"Could not delete {storage_path}: {e}")
+
+
 def load_file_path(storage_path: str) -> str:
-    """Return local file path (for local backend) or download from S3."""
+    """
+    Return local file path (for local backend) or download from S3. Blocking;
+    pass the result to release_file_path when done with it.
+    """
     if settings.STORAGE_BACKEND == "s3":
         # Download to temp file
-        import boto3, tempfile
-        s3 = boto3.client("s3", region_name=settings.AWS_REGION)
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=Path(storage_path).suffix)
-        s3.download_fileobj(settings.AWS_BUCKET, storage_path, tmp)
+        s3 = _s3_client()
+        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(storage_path).suffix) as tmp:
+            try:
+                s3.download_fileobj(settings.AWS_BUCKET, storage_path, tmp)
+            except Exception:
+                tmp.close()
+                Path(tmp.name).unlink(missing_ok=True)
+                raise
         return tmp.name
     return storage_path
+
+
+def release_file_path(storage_path: str, file_path: str) -> None:
+    """Remove the temporary copy load_file_path downloaded, if it made one."""
+    if file_path != storage_path:
+        Path(file_path).unlink(missing_ok=True)
@@ -0,0 +1,64 @@
+"""
+toxicity.py — process-wide Detoxify model cache and batched inference.
+
+The model is loaded once per process (optionally at startup, see
+warm_toxicity_model) and reused by every scoring call. Inference covers
+every text, in batches of TOXICITY_BATCH_SIZE. Texts are sorted by length
+first so each batch pads to a similar length.
+"""
+import logging
+import threading
+import numpy as np
+from typing import Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_toxicity_model():
+    """
+    Return the shared Detoxify model, loading it on first use.
+    Raises ImportError if detoxify is not installed.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from detoxify import Detoxify
+                _configure_torch_threads()
+                _model = Detoxify(settings.TOXICITY_MODEL)
+                logger.info(f"Loaded Detoxify model '{settings.TOXICITY_MODEL}'")
+    return _model
+
+
+def _configure_torch_threads() -> None:
+    if settings.TOXICITY_NUM_THREADS > 0:
+        import torch
+        torch.set_num_threads(settings.TOXICITY_NUM_THREADS)
+
+
+def predict_toxicity(texts: list[str], batch_size: Optional[int] = None) -> np.ndarray:
+    """Toxicity probability for every text, in input order."""
+    model = get_toxicity_model()
+    batch_size = batch_size or settings.TOXICITY_BATCH_SIZE
+
+    order  = np.argsort([len(t) for t in texts], kind="stable")
+    scores = np.empty(len(texts), dtype=float)
+    for start in range(0, len(texts), batch_size):
+        idx = order[start:start + batch_size]
+        batch = [texts[i] for i in idx]
+        scores[idx] = model.predict(batch)["toxicity"]
+    return scores
+
+
+def warm_toxicity_model() -> bool:
+    """Load the model and run one prediction so the first upload doesn't pay for it."""
+    try:
+        get_toxicity_model().predict(["warm-up"])
+        return True
+    except ImportError:
+        logger.warning("Detoxify not installed — skipping toxicity model warm-up")
+        return False
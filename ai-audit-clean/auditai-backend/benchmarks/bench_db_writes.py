@@ -0,0 +1,162 @@
+"""
+bench_db_writes.py — concurrent report commits on SQLite, before and after
+the database performance profile.
+
+Each profile gets a fresh database at the migration head. --processes
+worker processes, standing in for server workers, then run for --seconds:
+- --writers tasks each, committing one report with its full_report per
+  transaction, as /reports/generate does
+- --readers tasks each, fetching the first page of the report list
+
+The two profiles:
+- default: create_async_engine's defaults, as database.py had them. That
+  means a connection per session, a rollback journal, synchronous=FULL
+  and the sqlite3 module's 5s lock timeout.
+- tuned: make_engine with the DB_* and SQLITE_* settings. That means
+  pooled connections, WAL, synchronous=NORMAL, mmap and busy_timeout.
+
+For each profile it reports:
+- commits per second, with p50, p95 and max commit latency
+- list reads per second, with their p95
+- the number of "database is locked" failures
+
+    python benchmarks/bench_db_writes.py                    # 4 processes × 4 writers, 10s
+    python benchmarks/bench_db_writes.py --processes 8 --writers 8 --readers 2 --seconds 20
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, BACKEND)
+
+USER = "bench-user"
+
+
+def percentile(values: list, q: float) -> float:
+    return statistics.quantiles(values, n=100)[int(q) - 1] if len(values) > 1 else (values or [0])[0]
+
+
+def worker(profile: str, url: str, args, start_at: float, results) -> None:
+    os.environ["DATABASE_URL"]      = url
+    os.environ["ANTHROPIC_API_KEY"] = ""
+    asyncio.run(work(profile, url, args, start_at, results))
+
+
+async def work(profile: str, url: str, args, start_at: float, results) -> None:
+    from sqlalchemy import select
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from app.core.database import make_engine
+    from app.models.orm import Report
+    from app.services.report_builder import build_report
+    from app.services.claude_service import generate_ai_analysis
+
+    engine  = create_async_engine(url) if profile == "default" else make_engine(url)
+    session = async_sessionmaker(engine, expire_on_commit=False)
+    scores  = {"bias": .62, "hallucination": .31, "toxicity": .05, "robustness": .44,
+               "explainability": .58, "data_leakage": .12, "drift": .27}
+    info    = {"model_name": "bench", "framework": "all"}
+    full    = build_report(scores, info, await generate_ai_analysis(scores, info), 1000)
+    commits, reads, locked = [], [], 0
+
+    await asyncio.sleep(max(start_at - time.time(), 0))   # every process starts together
+    stop = time.time() + args.seconds
+
+    async def writer():
+        nonlocal locked
+        while time.time() < stop:
+            began = time.perf_counter()
+            try:
+                async with session() as db:
+                    db.add(Report(
+                        user_id=USER, model_name="bench", overall_risk="HIGH", readiness_pct=55,
+                        **{f"{metric}_score": value for metric, value in scores.items()},
+                        full_report=full,
+                    ))
+                    await db.commit()
+                commits.append(time.perf_counter() - began)
+            except OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                locked += 1
+
+    async def reader():
+        nonlocal locked
+        while time.time() < stop:
+            began = time.perf_counter()
+            try:
+                async with session() as db:
+                    await db.execute(
+                        select(Report.id, Report.created_at).where(Report.user_id == USER)
+                        .order_by(Report.created_at.desc(), Report.id.desc()).limit(50)
+                    )
+                reads.append(time.perf_counter() - began)
+            except OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                locked += 1
+
+    await asyncio.gather(*(writer() for _ in range(args.writers)), *(reader() for _ in range(args.readers)))
+    await engine.dispose()
+    results.put((commits, reads, locked))
+
+
+def run_profile(profile: str, args) -> None:
+    workdir = tempfile.mkdtemp(prefix=f"bench_db_{profile}_")
+    url = f"sqlite+aiosqlite:///{workdir}/bench.db"
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND, check=True,
+        env=dict(os.environ, DATABASE_URL=url), capture_output=True,
+    )
+    db = sqlite3.connect(f"{workdir}/bench.db")
+    db.execute("INSERT INTO users (id, email, hashed_password, plan, is_active, created_at) "
+               "VALUES (?, 'bench@example.com', '-', 'starter', 1, CURRENT_TIMESTAMP)", (USER,))
+    db.commit()
+    db.close()
+
+    context  = multiprocessing.get_context("spawn")
+    results  = context.Queue()
+    start_at = time.time() + 3 + 0.5 * args.processes   # time to import the app everywhere
+    procs = [context.Process(target=worker, args=(profile, url, args, start_at, results)) for _ in range(args.processes)]
+    for proc in procs:
+        proc.start()
+    outcomes = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+
+    commits = [t for c, _, _ in outcomes for t in c]
+    reads   = [t for _, r, _ in outcomes for t in r]
+    locked  = sum(n for _, _, n in outcomes)
+    print(
+        f"  {profile:<8} {len(commits) / args.seconds:>8.1f} commits/s  "
+        f"p50 {percentile(commits, 50) * 1000:>6.1f} ms  p95 {percentile(commits, 95) * 1000:>7.1f} ms  "
+        f"max {max(commits, default=0) * 1000:>7.1f} ms   "
+        f"{len(reads) / args.seconds:>7.1f} reads/s  p95 {percentile(reads, 95) * 1000:>6.1f} ms   "
+        f"locked {locked}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=4, help="writer tasks per process")
+    parser.add_argument("--readers", type=int, default=0, help="reader tasks per process, for a mixed load")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--profiles", default="default,tuned")
+    args = parser.parse_args()
+
+    print(f"{args.processes} processes × ({args.writers} writers + {args.readers} readers), {args.seconds:g}s each")
+    for profile in args.profiles.split(","):
+        run_profile(profile, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+bench_ingest.py — throughput and peak memory of the upload parsers.
+
+Writes a synthetic model-output file (scoring columns plus filler features)
+as CSV and as a JSON array, then parses each with every engine that is
+installed (INGEST_CSV_ENGINE: c / pyarrow, INGEST_JSON_ENGINE: json /
+orjson) the way score_source does. Files are written and parsed in child
+processes, so each peak RSS belongs to one engine alone. Every engine must
+produce the same scoring columns as the default one, checked by hashing
+their values, dtypes and names.
+
+    python benchmarks/bench_ingest.py                   # 1M rows
+    python benchmarks/bench_ingest.py --rows 200000 --extra-cols 10
+"""
+import argparse
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np   # noqa: E402
+import pandas as pd  # noqa: E402
+
+ENGINES = {"csv": ["c", "pyarrow"], "json": ["json", "orjson"]}
+
+
+def make_frame(n: int, extra_cols: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    confidence = rng.beta(4, 2, n).round(3)
+    confidence[rng.random(n) < 0.02] = np.nan
+    df = pd.DataFrame({
+        "prompt":       rng.choice([f"Application {i}" for i in range(1000)], n),
+        "response":     rng.choice([
+            "Approved based on income and stable employment.",
+            "Application declined due to insufficient credit history.",
+            "Please contact jane.doe@example.com for the next steps.",
+            "",
+        ], n),
+        "decision":     rng.choice(["approved", "rejected", "Approved ", "pending"], n),
+        "confidence":   confidence,
+        "ground_truth": rng.choice(["approved", "rejected"], n),
+        "gender":       rng.choice(["male", "female", "non-binary", None], n, p=[.48, .48, .03, .01]),
+        "race":         rng.choice(["a", "b", "c", "d"], n),
+        "age":          rng.integers(18, 80, n),
+    })
+    for i in range(extra_cols):
+        df[f"feature_{i}"] = rng.random(n).round(6) if i % 2 else rng.choice(["low", "mid", "high"], n)
+    return df
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """Hash of the columns the scorers read — the json engine parses the rest too, orjson doesn't."""
+    from app.services.scoring import scoring_columns
+    df = df[scoring_columns(list(df.columns)) or list(df.columns[:1])]
+    digest = hashlib.sha256()
+    digest.update(json.dumps([list(map(str, df.columns)), list(map(str, df.dtypes))]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def write_files(workdir: str, rows: int, extra_cols: int) -> None:
+    df = make_frame(rows, extra_cols)
+    df.to_csv(os.path.join(workdir, "outputs.csv"), index=False)
+    df.to_json(os.path.join(workdir, "outputs.json"), orient="records")
+
+
+def run_child(path: str, fmt: str, engine: str) -> None:
+    """Parse one file with one engine and print timings as JSON (runs in a subprocess)."""
+    from app.core.config import settings
+    from app.services import ingest
+
+    settings.INGEST_CSV_ENGINE  = engine
+    settings.INGEST_JSON_ENGINE = engine
+    used = ingest.csv_engine() if fmt == "csv" else ingest.json_engine()
+    if used != engine:
+        print(json.dumps({"skipped": f"{engine} is not installed"}))
+        return
+
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    header = ingest.sniff_columns(path) if fmt == "csv" else None
+    df, columns = ingest.read_frame(path, fmt, header)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "seconds":  elapsed,
+        "rows":     len(df),
+        "parsed":   len(df.columns),
+        "columns":  len(columns),
+        "rss_mb":   resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "delta_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss) / 1024,
+        "digest":   frame_digest(df),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--extra-cols", type=int, default=20, help="filler columns the scorers don't read")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per engine; the fastest is reported")
+    parser.add_argument("--child", nargs=3, metavar=("PATH", "FORMAT", "ENGINE"), help=argparse.SUPPRESS)
+    parser.add_argument("--write", metavar="DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+    if args.write:
+        write_files(args.write, args.rows, args.extra_cols)
+        return
+
+    # Children inherit the parent's peak RSS, so the data is generated in one too
+    workdir = tempfile.mkdtemp(prefix="bench_ingest_")
+    subprocess.run(
+        [sys.executable, __file__, "--write", workdir, "--rows", str(args.rows), "--extra-cols", str(args.extra_cols)],
+        check=True,
+    )
+    paths = {"csv": os.path.join(workdir, "outputs.csv"), "json": os.path.join(workdir, "outputs.json")}
+
+    failed = False
+    for fmt, engines in ENGINES.items():
+        size_mb = os.path.getsize(paths[fmt]) / 1e6
+        print(f"{fmt}: {args.rows:,} rows, {size_mb:,.0f} MB")
+        expected = None
+        for engine in engines:
+            runs = []
+            for _ in range(args.repeat):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--child", paths[fmt], fmt, engine],
+                    capture_output=True, text=True, check=True,
+                )
+                runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+                if "skipped" in runs[-1]:
+                    break
+            if "skipped" in runs[0]:
+                print(f"  {engine:<8} skipped: {runs[0]['skipped']}")
+                continue
+            best = min(runs, key=lambda r: r["seconds"])
+            expected = expected or best["digest"]
+            same = best["digest"] == expected
+            failed |= not same
+            print(
+                f"  {engine:<8} {best['seconds']:>7.2f}s  {size_mb / best['seconds']:>7,.0f} MB/s  "
+                f"peak RSS {best['rss_mb']:>6,.0f} MB (+{best['delta_mb']:,.0f} parsing)  "
+                f"{best['parsed']}/{best['columns']} columns  "
+                f"{'identical' if same else 'DIFFERENT ' + best['digest']}"
+            )
+
+    for path in paths.values():
+        os.unlink(path)
+    os.rmdir(workdir)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+bench_llm.py — load test of generate_ai_analysis against the stub API.
+
+Starts benchmarks/stub_anthropic.py and fires --calls concurrent analyses
+at it, once in the legacy style (a new synchronous client per call, called
+from the event loop) and once through the shared AsyncAnthropic client.
+For each it reports:
+- wall time
+- the longest event-loop stall, from a ticker task
+- the most calls the stub saw at once
+- the number of TCP connections the calls opened
+
+    python benchmarks/bench_llm.py                      # 32 calls, 0.5s each
+    python benchmarks/bench_llm.py --calls 200 --latency 1 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+SCORES = {
+    "bias": 0.62, "hallucination": 0.31, "toxicity": 0.05, "robustness": 0.44,
+    "explainability": 0.58, "data_leakage": 0.12, "drift": 0.27,
+}
+SYSTEM_INFO = {"model_name": "credit-scorer", "model_version": "2.1", "org_name": "Bench", "use_case": "Loan approval"}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def stub_stats(base_url: str, reset: bool = False) -> dict:
+    request = urllib.request.Request(f"{base_url}/stats" + ("/reset" if reset else ""), method="POST" if reset else "GET")
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def wait_for(base_url: str, timeout: float = 15.0) -> None:
+    deadline = time.time() + timeout
+    while True:
+        try:
+            stub_stats(base_url)
+            return
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+async def legacy_analysis(prompt: str) -> dict:
+    """The pre-pooling call: a new sync client per call, blocking the event loop."""
+    import anthropic
+    from app.core.config import settings
+    from app.services.claude_service import CLAUDE_MODEL
+
+    client = anthropic.Anthropic(
+        api_key=settings.ANTHROPIC_API_KEY, base_url=settings.ANTHROPIC_BASE_URL,
+        http_client=anthropic.DefaultHttpxClient(),
+    )
+    message = client.messages.create(model=CLAUDE_MODEL, max_tokens=1500, messages=[{"role": "user", "content": prompt}])
+    return json.loads(message.content[0].text)
+
+
+async def measure(name: str, calls: int, call, base_url: str) -> None:
+    stall = 0.0
+
+    async def ticker():
+        nonlocal stall
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stall = max(stall, time.perf_counter() - before - 0.01)
+
+    stub_stats(base_url, reset=True)
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    results = await asyncio.gather(*(call() for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.05)   # let the ticker see a stall that lasted until now
+    tick.cancel()
+    stats = stub_stats(base_url)
+    assert all("executiveSummary" in r for r in results)
+    print(
+        f"  {name:<22} {elapsed:>7.2f}s  {calls / elapsed:>7.1f} calls/s  loop stall {stall * 1000:>7.0f} ms  "
+        f"peak concurrent {stats['max_in_flight']:>3}  connections {stats['connections']:>3}"
+    )
+
+
+async def run(args, base_url: str) -> None:
+    from app.core.config import settings
+    from app.services import claude_service
+
+    settings.ANTHROPIC_API_KEY   = "stub"
+    settings.ANTHROPIC_BASE_URL  = base_url
+    settings.LLM_MAX_CONCURRENCY = args.concurrency
+
+    print(f"{args.calls} calls, {args.latency}s each, LLM_MAX_CONCURRENCY={args.concurrency}")
+    if not args.skip_legacy:
+        await measure("per-call sync client", args.calls, lambda: legacy_analysis("Audit this model."), base_url)
+    try:
+        await measure(
+            "shared async client", args.calls,
+            lambda: claude_service.generate_ai_analysis(SCORES, SYSTEM_INFO), base_url,
+        )
+        failed = claude_service.llm_stats()["failed"]
+        if failed:
+            raise SystemExit(f"{failed} calls fell back to the rule-based analysis")
+    finally:
+        await claude_service.close_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.5, help="stub seconds per call")
+    parser.add_argument("--concurrency", type=int, default=8, help="LLM_MAX_CONCURRENCY for the shared client")
+    parser.add_argument("--skip-legacy", action="store_true", help="don't run the (serial, slow) legacy variant")
+    args = parser.parse_args()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    stub = subprocess.Popen([
+        sys.executable, os.path.join(os.path.dirname(__file__), "stub_anthropic.py"),
+        "--port", str(port), "--latency", str(args.latency),
+    ])
+    try:
+        wait_for(base_url)
+        asyncio.run(run(args, base_url))
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
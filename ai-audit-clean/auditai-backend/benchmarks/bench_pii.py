@@ -0,0 +1,97 @@
+"""
+bench_pii.py — throughput of the PII scanner behind compute_data_leakage_score.
+
+Generates synthetic LLM responses (5% containing PII, a fifth of the rest
+carrying a reference number), checks the scanner against the original
+per-row re.search loop on a sample, then reports rows/sec at each size.
+
+    python benchmarks/bench_pii.py                      # 1M and 10M rows
+    python benchmarks/bench_pii.py --rows 100000 --pii-rate 0.2
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.pii import PII_PATTERNS, PIIScanner  # noqa: E402
+
+CLEAN = [
+    "Based on the applicant's financial profile, I recommend approval.",
+    "The applicant does not meet our minimum lending criteria.",
+    "Application declined due to insufficient credit history.",
+    "Approved based on income to debt ratio and stable employment.",
+    "I cannot help with that request, but here is some general guidance.",
+]
+LEAKY = [
+    "Please contact jane.doe@example.com for the next steps.",
+    "Call the branch on 555-867-5309 to confirm.",
+    "Card on file: 4111 1111 1111 1111.",
+    "Customer SSN 123-45-6789 was verified.",
+    "Request originated from 192.168.10.24.",
+    "NI number QQ123456C is on record.",
+    "Use api_key=sk-test-abc123 for the sandbox.",
+]
+
+
+def make_texts(n: int, pii_rate: float, numeric_rate: float = 0.2, seed: int = 0) -> list[str]:
+    """pii_rate of rows leak PII; numeric_rate of the clean rows still carry a number."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        if rng.random() < pii_rate:
+            texts.append(rng.choice(LEAKY))
+        elif rng.random() < numeric_rate:
+            texts.append(f"{rng.choice(CLEAN)} Reference {rng.randrange(10**6)}.")
+        else:
+            texts.append(rng.choice(CLEAN))
+    return texts
+
+
+def legacy_flagged(texts: list[str]) -> int:
+    """The pre-scanner implementation: uncompiled patterns, one row at a time."""
+    count = 0
+    for text in texts:
+        for pattern in PII_PATTERNS.values():
+            if re.search(pattern, text):
+                count += 1
+                break
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1000000,10000000", help="comma-separated row counts")
+    parser.add_argument("--pii-rate", type=float, default=0.05)
+    parser.add_argument("--numeric-rate", type=float, default=0.2)
+    parser.add_argument("--legacy-sample", type=int, default=200_000,
+                        help="rows timed with the legacy loop for comparison")
+    args = parser.parse_args()
+
+    scanner = PIIScanner()
+
+    sample = make_texts(args.legacy_sample, args.pii_rate, args.numeric_rate, seed=1)
+    start = time.perf_counter()
+    expected = legacy_flagged(sample)
+    legacy_rps = len(sample) / (time.perf_counter() - start)
+    result = scanner.scan(sample)
+    assert result.flagged == expected, f"scanner flagged {result.flagged}, legacy loop {expected}"
+    print(f"legacy loop      {len(sample):>12,} rows  {legacy_rps:>14,.0f} rows/s")
+
+    for n in (int(r) for r in args.rows.split(",")):
+        texts = make_texts(n, args.pii_rate, args.numeric_rate)
+        start = time.perf_counter()
+        result = scanner.scan(texts)
+        elapsed = time.perf_counter() - start
+        print(
+            f"scanner          {n:>12,} rows  {n / elapsed:>14,.0f} rows/s  "
+            f"({elapsed:.2f}s, rate={result.rate:.4f}, hits={result.hits})"
+        )
+        del texts
+
+
+if __name__ == "__main__":
+    main()
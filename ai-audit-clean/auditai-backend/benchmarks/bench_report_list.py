@@ -0,0 +1,151 @@
+"""
+bench_report_list.py — GET /reports/ latency as a user's history grows.
+
+Builds a SQLite database at the current migration head and fills it, in
+steps, with reports for one user. Every report carries the same full_report
+a rule-based audit produces. Reports from other users are mixed in, so the
+index has to pick them out. At each size it times:
+- the pre-pagination query: whole Report rows with their full reports, every
+  one of the user's reports
+- the first page through the endpoint
+- a page near the end of the history, through the endpoint with a cursor
+
+    python benchmarks/bench_report_list.py                  # 1k, 10k, 50k reports
+    python benchmarks/bench_report_list.py --sizes 1000,100000 --limit 100
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+WORKDIR = tempfile.mkdtemp(prefix="bench_report_list_")
+os.environ["DATABASE_URL"]      = f"sqlite+aiosqlite:///{WORKDIR}/bench.db"
+os.environ["ANTHROPIC_API_KEY"] = ""
+
+USER   = "bench-user"
+OTHERS = 4   # other users, each with a quarter as many reports
+SCORES = {
+    "bias": 0.62, "hallucination": 0.31, "toxicity": 0.05, "robustness": 0.44,
+    "explainability": 0.58, "data_leakage": 0.12, "drift": 0.27,
+}
+
+
+async def full_report() -> dict:
+    from app.services.claude_service import generate_ai_analysis
+    from app.services.report_builder import build_report
+
+    info = {"model_name": "credit-scorer", "org_name": "Bench", "framework": "all"}
+    return build_report(SCORES, info, await generate_ai_analysis(SCORES, info), 10000)
+
+
+async def seed(start: int, stop: int, report: dict) -> None:
+    """Reports start..stop-1 for USER, and a quarter as many for each other user."""
+    from sqlalchemy import insert
+    from app.core.database import engine
+    from app.models.orm import Report, ReportContent
+
+    t0 = datetime(2024, 1, 1)
+
+    def row(user_id: str, i: int) -> dict:
+        return {
+            "id": f"{user_id}-{i:08d}", "user_id": user_id, "model_name": f"model-{i % 37}",
+            "org_name": "Bench", "framework": "all", "overall_risk": "HIGH", "readiness_pct": 55,
+            **{f"{metric}_score": value for metric, value in SCORES.items()},
+            "created_at": t0 + timedelta(seconds=i),
+        }
+
+    async with engine.begin() as conn:
+        for chunk in range(start, stop, 5000):
+            rows = [row(USER, i) for i in range(chunk, min(chunk + 5000, stop))]
+            for other in range(OTHERS):
+                rows += [row(f"other-{other}", i) for i in range(chunk, min(chunk + 5000, stop), 4)]
+            await conn.execute(insert(Report), rows)
+            await conn.execute(insert(ReportContent), [{"report_id": r["id"], "full_report": report} for r in rows])
+
+
+async def timed(fn, repeat: int) -> float:
+    """Median seconds of fn() over repeat runs, after one warm-up."""
+    await fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+async def run(args) -> None:
+    import httpx
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+    from app.core.database import ALEMBIC_INI, AsyncSessionLocal, engine
+    from app.core.security import create_access_token
+    from app.main import app
+    from app.models.orm import Report
+    from app.routers.reports import _encode_cursor, _to_list_item
+
+    await asyncio.to_thread(command.upgrade, Config(ALEMBIC_INI), "head")
+    report = await full_report()
+    token  = create_access_token({"sub": USER, "email": "bench@example.com"})
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    async def legacy():
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Report).where(Report.user_id == USER).order_by(Report.created_at.desc())
+                .options(selectinload(Report.content))
+            )
+            return [_to_list_item(r) for r in result.scalars().all()]
+
+    async def page(cursor=None):
+        params = {"limit": args.limit, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/reports/", params=params)
+        response.raise_for_status()
+        return response
+
+    print(f"page size {args.limit}, full_report {len(str(report)) // 1024} KB, median of {args.repeat}")
+    print(f"  {'reports':>8}  {'all rows (old)':>15}  {'first page':>11}  {'deep page':>10}")
+    seeded = 0
+    for size in args.sizes:
+        await seed(seeded, size, report)
+        seeded = size
+        # Cursor after the (limit + 2)-th oldest report: a full page, with one report still behind it
+        i = args.limit + 1
+        deep_cursor = _encode_cursor(datetime(2024, 1, 1) + timedelta(seconds=i), f"{USER}-{i:08d}")
+        response = await page(deep_cursor)
+        assert len(response.json()) == args.limit and "X-Next-Cursor" in response.headers
+
+        old   = await timed(legacy, args.repeat) if size <= args.legacy_max else None
+        first = await timed(page, args.repeat)
+        last  = await timed(lambda: page(deep_cursor), args.repeat)
+        old_s = f"{old * 1000:>12.1f} ms" if old is not None else f"{'skipped':>15}"
+        print(f"  {size:>8}  {old_s}  {first * 1000:>8.1f} ms  {last * 1000:>7.1f} ms")
+
+    await client.aclose()
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,50000", help="history sizes to measure, ascending")
+    parser.add_argument("--limit", type=int, default=50, help="page size")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy-max", type=int, default=50000, help="skip the old query above this many reports")
+    args = parser.parse_args()
+    args.sizes = sorted(int(size) for size in args.sizes.split(","))
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+sqlite_replica.py — a local stand-in for a lagging read replica.
+
+Copies a SQLite primary into a second file every --lag seconds, with
+SQLite's online backup, so the copy is always a consistent snapshot that
+trails the primary by up to that long. Run the backend with both files:
+
+    python benchmarks/sqlite_replica.py                   # ./auditai.db → ./auditai-replica.db, 2s behind
+    DATABASE_READ_URL=sqlite+aiosqlite:///./auditai-replica.db uvicorn app.main:app
+
+    python benchmarks/sqlite_replica.py --primary /tmp/a.db --replica /tmp/b.db --lag 5
+
+Report lists and fetches then read the copy, except right after a user's
+own writes; GET /health shows the split under "db_reads". Against Postgres
+use a real streaming replica instead (or, to exercise the routing alone,
+point DATABASE_READ_URL at the primary itself).
+"""
+import argparse
+import sqlite3
+import time
+
+
+def copy(primary: str, replica: str) -> float:
+    """Snapshot primary into replica; returns the seconds it took."""
+    start = time.perf_counter()
+    source = sqlite3.connect(f"file:{primary}?mode=ro", uri=True)
+    target = sqlite3.connect(replica, timeout=30)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--primary", default="./auditai.db")
+    parser.add_argument("--replica", default="./auditai-replica.db")
+    parser.add_argument("--lag", type=float, default=2, help="seconds between snapshots")
+    parser.add_argument("--once", action="store_true", help="take one snapshot and exit")
+    args = parser.parse_args()
+
+    while True:
+        took = copy(args.primary, args.replica)
+        if args.once:
+            print(f"copied {args.primary} → {args.replica} in {took * 1000:.0f} ms")
+            return
+        time.sleep(max(args.lag - took, 0))
+
+
+if __name__ == "__main__":
+    main()
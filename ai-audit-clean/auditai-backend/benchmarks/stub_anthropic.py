@@ -0,0 +1,151 @@
+"""
+stub_anthropic.py — a local stand-in for the Anthropic Messages API.
+
+Answers POST /v1/messages after a configurable delay with a fixed analysis
+in the shape generate_ai_analysis expects, and counts requests, concurrent
+requests and distinct client connections (GET /stats, reset with
+POST /stats/reset). With "stream": true the answer comes as the API's
+server-sent events: the first text after a tenth of the delay, the rest in
+STREAM_CHUNKS pieces spread over the remainder.
+
+Run the backend against it with ANTHROPIC_BASE_URL=http://127.0.0.1:8765
+and any ANTHROPIC_API_KEY.
+
+    python benchmarks/stub_anthropic.py                   # port 8765, 1s per call
+    python benchmarks/stub_anthropic.py --latency 0.2 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import random
+import uuid
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+STREAM_CHUNKS = 20
+
+ANALYSIS = {
+    "executiveSummary": "Stub analysis: the audited system shows elevated bias and drift risk.",
+    "topPriority": "Run a fairness audit across protected attributes (EU AI Act Art. 10(2)).",
+    "complianceNarrative": "Stub narrative: moderate regulatory exposure pending remediation.",
+    "recommendations": [
+        {
+            "title": "Stub recommendation",
+            "detail": "Returned by benchmarks/stub_anthropic.py, not by Claude.",
+            "effort": "Medium",
+            "timeline": "Short-term (2-6 weeks)",
+            "regulation": "EU AI Act Art. 10(2)",
+        }
+    ],
+    "readinessAssessment": "Stub assessment: conditionally ready.",
+}
+
+
+class Stub:
+    def __init__(self, latency: float, jitter: float, error_rate: float):
+        self.latency    = latency
+        self.jitter     = jitter
+        self.error_rate = error_rate
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests      = 0
+        self.errors        = 0
+        self.in_flight     = 0
+        self.max_in_flight = 0
+        self.connections: set = set()
+
+    async def messages(self, request: Request):
+        body = await request.json()
+        if not body.get("model") or not body.get("messages"):
+            return JSONResponse({"type": "error", "error": {"type": "invalid_request_error", "message": "model and messages are required"}}, 400)
+
+        self.requests += 1
+        self.connections.add(tuple(request.scope.get("client") or ()))
+        delay = max(self.latency + random.uniform(-self.jitter, self.jitter), 0)
+        if random.random() < self.error_rate:
+            self.errors += 1
+            return JSONResponse({"type": "error", "error": {"type": "overloaded_error", "message": "Stub overloaded"}}, 529)
+
+        message = {
+            "id":            f"msg_stub_{uuid.uuid4().hex[:12]}",
+            "type":          "message",
+            "role":          "assistant",
+            "model":         body["model"],
+            "content":       [{"type": "text", "text": json.dumps(ANALYSIS)}],
+            "stop_reason":   "end_turn",
+            "stop_sequence": None,
+            "usage":         {"input_tokens": len(json.dumps(body["messages"])) // 4, "output_tokens": 200},
+        }
+        if body.get("stream"):
+            return StreamingResponse(self._stream(message, delay), media_type="text/event-stream")
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+        return JSONResponse(message)
+
+    async def _stream(self, message: dict, delay: float):
+        def event(name: str, data: dict) -> str:
+            return f"event: {name}\ndata: {json.dumps({'type': name, **data})}\n\n"
+
+        text = message["content"][0]["text"]
+        size = -(-len(text) // STREAM_CHUNKS)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(delay / 10)
+            yield event("message_start", {"message": {
+                **message, "content": [], "stop_reason": None, "usage": {**message["usage"], "output_tokens": 1},
+            }})
+            yield event("content_block_start", {"index": 0, "content_block": {"type": "text", "text": ""}})
+            for start in range(0, len(text), size):
+                yield event("content_block_delta", {"index": 0, "delta": {"type": "text_delta", "text": text[start:start + size]}})
+                await asyncio.sleep(delay * 0.9 / STREAM_CHUNKS)
+            yield event("content_block_stop", {"index": 0})
+            yield event("message_delta", {"delta": {"stop_reason": "end_turn", "stop_sequence": None}, "usage": {"output_tokens": 200}})
+            yield event("message_stop", {})
+        finally:
+            self.in_flight -= 1
+
+    async def stats(self, request: Request):
+        if request.method == "POST":
+            self.reset()
+        return JSONResponse({
+            "requests":      self.requests,
+            "errors":        self.errors,
+            "in_flight":     self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "connections":   len(self.connections),
+        })
+
+
+def build_app(latency: float = 1.0, jitter: float = 0.0, error_rate: float = 0.0) -> Starlette:
+    stub = Stub(latency, jitter, error_rate)
+    return Starlette(routes=[
+        Route("/v1/messages", stub.messages, methods=["POST"]),
+        Route("/stats", stub.stats, methods=["GET"]),
+        Route("/stats/reset", stub.stats, methods=["POST"]),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± seconds of random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls answered with a 529")
+    args = parser.parse_args()
+    uvicorn.run(build_app(args.latency, args.jitter, args.error_rate), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
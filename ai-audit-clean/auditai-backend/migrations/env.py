@@ -0,0 +1,61 @@
+"""
+env.py — runs Alembic migrations against DATABASE_URL.
+
+From the command line (`alembic upgrade head`) it opens its own connection.
+init_db passes the connection it already holds in config.attributes, so
+migrating at startup runs inside the app's event loop.
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import DATABASE_URL, Base
+from app.models import orm  # noqa — registers the tables on Base.metadata
+
+config = context.config
+target_metadata = Base.metadata
+
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name)   # leave the app's logging alone when it runs us
+
+
+def run_migrations_offline() -> None:
+    """`alembic upgrade head --sql`: print the SQL instead of running it."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=DATABASE_URL.startswith("sqlite"),
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",   # SQLite can't ALTER most things in place
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    engine = create_async_engine(DATABASE_URL, poolclass=pool.NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+elif "connection" in config.attributes:
+    do_run_migrations(config.attributes["connection"])
+else:
+    asyncio.run(run_async_migrations())
@@ -0,0 +1,150 @@
+"""initial schema
+
+The tables as init_db's create_all left them, so existing databases can be
+adopted as they are. Tables that already exist are kept, and any columns
+they lack are added: create_all never added columns to existing tables, so
+a database that was first created before blobs existed has uploads without
+blob_id, scores, column_map and engine_version.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:12:04.511283
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def tables() -> list[tuple[str, list]]:
+    """(table, columns and constraints), parents before children."""
+    return [
+        ("users", [
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("org_name", sa.String(), nullable=True),
+            sa.Column("plan", sa.String(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("email"),
+        ]),
+        ("blobs", [
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("content_hash", sa.String(), nullable=False),
+            sa.Column("ext", sa.String(), nullable=False),
+            sa.Column("storage_path", sa.String(), nullable=False),
+            sa.Column("columnar_path", sa.String(), nullable=True),
+            sa.Column("size_bytes", sa.Integer(), nullable=False),
+            sa.Column("row_count", sa.Integer(), nullable=False),
+            sa.Column("columns", sa.JSON(), nullable=True),
+            sa.Column("scores", sa.JSON(), nullable=True),
+            sa.Column("column_map", sa.JSON(), nullable=True),
+            sa.Column("engine_version", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("content_hash", "ext"),
+        ]),
+        ("uploads", [
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("blob_id", sa.String(), nullable=True),
+            sa.Column("filename", sa.String(), nullable=False),
+            sa.Column("storage_path", sa.String(), nullable=False),
+            sa.Column("row_count", sa.Integer(), nullable=False),
+            sa.Column("scores", sa.JSON(), nullable=True),
+            sa.Column("column_map", sa.JSON(), nullable=True),
+            sa.Column("engine_version", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["blob_id"], ["blobs.id"]),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        ]),
+        ("reports", [
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("model_name", sa.String(), nullable=True),
+            sa.Column("model_version", sa.String(), nullable=True),
+            sa.Column("org_name", sa.String(), nullable=True),
+            sa.Column("use_case", sa.String(), nullable=True),
+            sa.Column("deploy_env", sa.String(), nullable=True),
+            sa.Column("framework", sa.String(), nullable=False),
+            sa.Column("bias_score", sa.Float(), nullable=True),
+            sa.Column("hallucination_score", sa.Float(), nullable=True),
+            sa.Column("toxicity_score", sa.Float(), nullable=True),
+            sa.Column("robustness_score", sa.Float(), nullable=True),
+            sa.Column("explainability_score", sa.Float(), nullable=True),
+            sa.Column("data_leakage_score", sa.Float(), nullable=True),
+            sa.Column("drift_score", sa.Float(), nullable=True),
+            sa.Column("overall_risk", sa.String(), nullable=True),
+            sa.Column("readiness_pct", sa.Integer(), nullable=True),
+            sa.Column("full_report", sa.JSON(), nullable=True),
+            sa.Column("pdf_path", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        ]),
+        ("report_jobs", [
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("request", sa.JSON(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("stage", sa.String(), nullable=True),
+            sa.Column("report_id", sa.String(), nullable=True),
+            sa.Column("error", sa.String(), nullable=True),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("started_at", sa.DateTime(), nullable=True),
+            sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["report_id"], ["reports.id"], ondelete="SET NULL"),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        ]),
+        ("llm_cache", [
+            sa.Column("key", sa.String(), nullable=False),
+            sa.Column("model", sa.String(), nullable=False),
+            sa.Column("result", sa.JSON(), nullable=False),
+            sa.Column("hits", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("last_hit_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("key"),
+        ]),
+    ]
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():   # `--sql`: nothing to inspect, script an empty database
+        for name, elements in tables():
+            op.create_table(name, *elements)
+        return
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+    for name, elements in tables():
+        if name not in existing:
+            op.create_table(name, *elements)
+            continue
+        present = {column["name"] for column in inspector.get_columns(name)}
+        missing = [e for e in elements if isinstance(e, sa.Column) and e.name not in present]
+        if missing:
+            # Only nullable columns were ever added after a table first shipped
+            with op.batch_alter_table(name) as batch:
+                for column in missing:
+                    batch.add_column(column)
+                if name == "uploads" and "blob_id" in {c.name for c in missing}:
+                    batch.create_foreign_key("fk_uploads_blob_id_blobs", "blobs", ["blob_id"], ["id"])
+
+
+def downgrade() -> None:
+    for name, _ in reversed(tables()):
+        op.drop_table(name)
@@ -0,0 +1,39 @@
+"""performance indexes
+
+Every list and lookup filters on user_id and the list endpoints order by
+created_at, so (user_id, created_at DESC) serves both the filter and the
+sort from the index. The report job sweep selects by status in created_at
+order, and the analysis cache is pruned by expires_at and created_at.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:40:51.208730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_reports_user_id_created_at", "reports", ["user_id", sa.text("created_at DESC")])
+    op.create_index("ix_uploads_user_id_created_at", "uploads", ["user_id", sa.text("created_at DESC")])
+    op.create_index("ix_report_jobs_status_created_at", "report_jobs", ["status", "created_at"])
+    op.create_index("ix_llm_cache_expires_at", "llm_cache", ["expires_at"])
+    op.create_index("ix_llm_cache_created_at", "llm_cache", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_cache_created_at", table_name="llm_cache")
+    op.drop_index("ix_llm_cache_expires_at", table_name="llm_cache")
+    op.drop_index("ix_report_jobs_status_created_at", table_name="report_jobs")
+    op.drop_index("ix_uploads_user_id_created_at", table_name="uploads")
+    op.drop_index("ix_reports_user_id_created_at", table_name="reports")
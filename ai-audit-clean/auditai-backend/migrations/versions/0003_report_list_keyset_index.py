@@ -0,0 +1,35 @@
+"""report list keyset index
+
+GET /reports/ pages on (created_at, id), newest first. With id in the
+index as well, a page is read straight off the index in order, with no
+sort for reports that share a created_at.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:05:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_reports_user_id_created_at_id", "reports",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.drop_index("ix_reports_user_id_created_at", table_name="reports")
+
+
+def downgrade() -> None:
+    op.create_index("ix_reports_user_id_created_at", "reports", ["user_id", sa.text("created_at DESC")])
+    op.drop_index("ix_reports_user_id_created_at_id", table_name="reports")
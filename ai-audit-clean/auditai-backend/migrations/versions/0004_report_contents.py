@@ -0,0 +1,81 @@
+"""report contents
+
+Moves reports.full_report into report_contents, compressed (CompressedJSON),
+and drops the column. Report rows shrink to their scalar fields, so scans
+of reports read far fewer pages; the full report is read, and decompressed,
+only by GET /reports/{id}. Rows are copied in batches of COPY_BATCH.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 13:21:09.664810
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.models.types import CompressedJSON
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COPY_BATCH = 500
+
+reports  = sa.table("reports", sa.column("id", sa.String()), sa.column("full_report", sa.JSON()))
+contents = sa.table("report_contents", sa.column("report_id", sa.String()), sa.column("full_report", CompressedJSON()))
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():
+        raise RuntimeError("This migration compresses rows in Python; run it online, not with --sql")
+    op.create_table(
+        "report_contents",
+        sa.Column("report_id", sa.String(), nullable=False),
+        sa.Column("full_report", CompressedJSON(), nullable=False),
+        sa.ForeignKeyConstraint(["report_id"], ["reports.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("report_id"),
+    )
+    bind = op.get_bind()
+    last = ""
+    while True:
+        rows = bind.execute(
+            sa.select(reports.c.id, reports.c.full_report)
+            .where(reports.c.id > last)
+            .order_by(reports.c.id)
+            .limit(COPY_BATCH)
+        ).all()
+        if not rows:
+            break
+        values = [{"report_id": id_, "full_report": value} for id_, value in rows if value is not None]
+        if values:
+            bind.execute(sa.insert(contents), values)
+        last = rows[-1][0]
+    with op.batch_alter_table("reports") as batch:
+        batch.drop_column("full_report")
+
+
+def downgrade() -> None:
+    if context.is_offline_mode():
+        raise RuntimeError("This migration decompresses rows in Python; run it online, not with --sql")
+    with op.batch_alter_table("reports") as batch:
+        batch.add_column(sa.Column("full_report", sa.JSON(), nullable=True))
+    bind = op.get_bind()
+    last = ""
+    while True:
+        rows = bind.execute(
+            sa.select(contents.c.report_id, contents.c.full_report)
+            .where(contents.c.report_id > last)
+            .order_by(contents.c.report_id)
+            .limit(COPY_BATCH)
+        ).all()
+        if not rows:
+            break
+        for report_id, value in rows:
+            bind.execute(sa.update(reports).where(reports.c.id == report_id).values(full_report=value))
+        last = rows[-1][0]
+    op.drop_table("report_contents")
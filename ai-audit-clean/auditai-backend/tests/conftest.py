@@ -0,0 +1,53 @@
+"""
+Every test runs against its own SQLite database and storage directory,
+migrated to the head once per session, with no Claude key (rule-based
+analysis) and scoring on a thread of the test process.
+"""
+import asyncio
+import os
+import tempfile
+
+WORKDIR = tempfile.mkdtemp(prefix="auditai_tests_")
+os.environ["DATABASE_URL"]          = f"sqlite+aiosqlite:///{WORKDIR}/primary.db"
+os.environ["DATABASE_READ_URL"]     = ""
+os.environ["STORAGE_LOCAL_DIR"]     = f"{WORKDIR}/uploads"
+os.environ["STORAGE_BACKEND"]       = "local"
+os.environ["ANTHROPIC_API_KEY"]     = ""
+os.environ["SCORING_WORKERS"]       = "0"
+os.environ["DB_MIGRATE_ON_STARTUP"] = "true"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+
+def run(coro):
+    """asyncio.run(coro), then close pooled connections, which belong to that run's loop."""
+    from app.core.database import engine, read_engine
+
+    async def main():
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+            if read_engine is not engine:
+                await read_engine.dispose()
+    return asyncio.run(main())
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated():
+    from app.core.database import init_db
+    run(init_db())
+
+
+def client(app=None) -> httpx.AsyncClient:
+    """An HTTP client calling the app in-process."""
+    from app.main import app as main_app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app or main_app), base_url="http://test")
+
+
+async def register(http: httpx.AsyncClient, email: str) -> dict:
+    """Register a user; returns the Authorization header for them."""
+    response = await http.post("/auth/register", json={"email": email, "password": "pw"})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,37 @@
+"""
+Shard states, each round-tripped through JSON and merged in row order, must
+score like compute_all_scores over the whole frame (drift apart).
+"""
+import json
+
+import pandas as pd
+import pytest
+
+from app.services.accumulators import ScoreAccumulator, merge_states, partial_state
+from app.services.scoring import compute_all_scores
+from tests.test_streaming_scores import EXACT, ROWS, assert_same_scores, make_rows
+
+SPLITS = [(1, 2), (ROWS // 3, 2 * ROWS // 3), (7, ROWS - 500)]   # where the second and third shards start
+
+
+@pytest.mark.parametrize("split", SPLITS)
+def test_merged_shards_match_whole_frame(split):
+    df     = pd.DataFrame(make_rows(seed=5))
+    shards = [df.iloc[:split[0]], df.iloc[split[0]:split[1]], df.iloc[split[1]:]]
+    states = [ScoreAccumulator.from_dict(json.loads(json.dumps(partial_state(shard).to_dict()))) for shard in shards]
+
+    merged = merge_states(states)
+    assert merged.rows == len(df)
+    assert_same_scores(merged.scores(), compute_all_scores(df))
+
+
+def test_round_trip_keeps_the_state():
+    state    = partial_state(pd.DataFrame(make_rows(seed=9)))
+    restored = ScoreAccumulator.from_dict(json.loads(json.dumps(state.to_dict())))
+    assert restored.to_dict() == state.to_dict()
+    assert {k: restored.scores()[k] for k in EXACT} == {k: state.scores()[k] for k in EXACT}
+
+
+def test_unknown_state_version_is_rejected():
+    with pytest.raises(ValueError):
+        ScoreAccumulator.from_dict({**ScoreAccumulator().to_dict(), "version": -1})
@@ -0,0 +1,66 @@
+"""ScoringExecutor: bounded queue, and recovery from a worker process dying."""
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.services.executor import ScoringExecutor, ScoringQueueFull, ScoringUnavailable, get_scoring_executor
+from app.services.storage import blob_key
+from tests.conftest import client, register, run
+
+
+def test_pool_is_replaced_after_a_worker_dies():
+    async def scenario():
+        executor = ScoringExecutor(workers=2, max_queue=4, timeout=120)
+        try:
+            assert await executor.run(pow, 2, 10) == 1024
+            with pytest.raises(ScoringUnavailable):
+                await executor.run(os._exit, 1)   # the worker dies mid-job
+            assert await executor.run(pow, 3, 3) == 27
+            stats = executor.stats()
+            assert stats["restarts"] == 1
+            assert stats["queue_depth"] == 0
+        finally:
+            executor.shutdown()
+    asyncio.run(scenario())
+
+
+def test_upload_during_a_pool_restart_is_503_and_keeps_the_file(monkeypatch):
+    async def unavailable(fn, *args, **kwargs):
+        raise ScoringUnavailable("A scoring worker died while running the job")
+    monkeypatch.setattr(get_scoring_executor(), "run", unavailable)
+    csv = b"decision,gender\napproved,M\ndenied,F\n"
+
+    async def scenario():
+        async with client() as http:
+            headers  = await register(http, "restart@example.com")
+            response = await http.post("/upload/", files={"file": ("x.csv", csv, "text/csv")}, headers=headers)
+            assert response.status_code == 503
+            assert os.path.exists(os.path.join(settings.STORAGE_LOCAL_DIR, blob_key(hashlib.sha256(csv).hexdigest(), ".csv")))
+            monkeypatch.undo()
+            response = await http.post("/upload/", files={"file": ("x.csv", csv, "text/csv")}, headers=headers)
+            assert response.status_code == 200
+    run(scenario())
+
+
+def test_queue_is_bounded():
+    async def scenario():
+        executor = ScoringExecutor(workers=0, max_queue=1, timeout=10)
+        try:
+            slow = asyncio.create_task(executor.run(_sleep, 0.5))
+            await asyncio.sleep(0.05)
+            with pytest.raises(ScoringQueueFull):
+                await executor.run(pow, 2, 2)
+            await slow
+            assert await executor.run(pow, 2, 2) == 4
+        finally:
+            executor.shutdown()
+    asyncio.run(scenario())
+
+
+def _sleep(seconds: float) -> float:
+    import time
+    time.sleep(seconds)
+    return seconds
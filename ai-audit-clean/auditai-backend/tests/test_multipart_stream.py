@@ -0,0 +1,198 @@
+"""
+_FilePart must hand the file field's bytes to the sink exactly as sent,
+however the body is split across writes, and agree with python-multipart.
+"""
+import asyncio
+import random
+
+import pytest
+from multipart.multipart import MultipartParser
+from starlette.requests import Request
+
+from app.services.multipart_stream import InvalidUpload, _FilePart, receive_file
+
+BOUNDARY = b"----auditaiBoundary7MA4YWxk"
+
+
+class Collect:
+    def __init__(self):
+        self.data    = bytearray()
+        self.aborted = False
+
+    def write(self, chunk: bytes) -> None:
+        self.data += chunk
+
+    def abort(self) -> None:
+        self.aborted = True
+
+
+def body(parts: list[tuple[str, bytes, str | None]], preamble: bytes = b"", epilogue: bytes = b"",
+         padding: bytes = b"") -> bytes:
+    """A multipart body of (field name, data, filename or None) parts."""
+    out = bytearray(preamble + (b"\r\n" if preamble else b""))
+    for name, data, filename in parts:
+        disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+        out += b"--" + BOUNDARY + padding + b"\r\n"
+        out += f"Content-Disposition: {disposition}\r\n".encode()
+        if filename:
+            out += b"Content-Type: application/octet-stream\r\n"
+        out += b"\r\n" + data + b"\r\n"
+    out += b"--" + BOUNDARY + b"--" + padding + (b"\r\n" + epilogue if epilogue else b"")
+    return bytes(out)
+
+
+def parse(raw: bytes, cuts=(), field: str = "file") -> tuple[_FilePart, Collect]:
+    sink = Collect()
+    part = _FilePart(BOUNDARY, field, lambda filename: sink)
+    start = 0
+    for cut in sorted(cuts) + [len(raw)]:
+        part.write(raw[start:cut])
+        start = cut
+    part.finalize()
+    return part, sink
+
+
+def python_multipart_file(raw: bytes, cuts, field: str = "file") -> bytes:
+    """The field's data as python-multipart parses it, fed the same writes."""
+    state = {"headers": b"", "current": None, "data": bytearray()}
+
+    def on_header_value(data, start, end):
+        state["headers"] += data[start:end]
+
+    def on_headers_finished():
+        state["current"] = f'name="{field}"'.encode() in state["headers"]
+        state["headers"] = b""
+
+    def on_part_data(data, start, end):
+        if state["current"]:
+            state["data"] += data[start:end]
+
+    parser = MultipartParser(BOUNDARY, callbacks={
+        "on_header_value":     on_header_value,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data":        on_part_data,
+    })
+    start = 0
+    for cut in sorted(cuts) + [len(raw)]:
+        parser.write(raw[start:cut])
+        start = cut
+    parser.finalize()
+    return bytes(state["data"])
+
+
+def test_file_data_arrives_whole():
+    data = b"decision,gender\napproved,M\n" * 1000
+    part, sink = parse(body([("file", data, "outputs.csv")]))
+    assert part.filename == "outputs.csv"
+    assert bytes(sink.data) == data
+
+
+def test_delimiter_split_across_writes():
+    data = b"a,b\n1,2\n" * 50
+    raw  = body([("file", data, "x.csv"), ("note", b"hi", None)])
+    at   = raw.index(b"\r\n--" + BOUNDARY, raw.index(b"a,b"))
+    for offset in range(len(BOUNDARY) + 5):
+        _, sink = parse(raw, cuts=[at + offset])
+        assert bytes(sink.data) == data, offset
+
+
+def test_boundary_look_alikes_in_file_data():
+    # Everything but CRLF "--" boundary, which the sender must not put in a part
+    data = (b"\r\n\r\n--" + BOUNDARY[:-1] + b"x\r\n--" + BOUNDARY[:-1]
+            + b"\r\n-" + BOUNDARY + b"\n--" + BOUNDARY + b"\r--" + BOUNDARY + b",--" + BOUNDARY + b"\r\n")
+    raw  = body([("file", data, "x.csv")])
+    for cut in range(1, len(raw)):
+        _, sink = parse(raw, cuts=[cut])
+        assert bytes(sink.data) == data, cut
+
+
+def test_preamble_epilogue_and_transport_padding():
+    data = b"decision\napproved\n"
+    raw  = body([("file", data, "x.csv")], preamble=b"This is a preamble.",
+                epilogue=b"An epilogue\r\n--" + BOUNDARY + b"\r\n", padding=b" \t ")
+    _, sink = parse(raw)
+    assert bytes(sink.data) == data
+
+
+def test_text_field_before_the_file_is_skipped():
+    data = b"decision\ndenied\n"
+    raw  = body([("description", b"not the file", None), ("other", b"nope", "other.csv"), ("file", data, "x.csv")])
+    part, sink = parse(raw)
+    assert part.filename == "x.csv"
+    assert bytes(sink.data) == data
+
+
+def test_missing_field_opens_no_sink():
+    part, _ = parse(body([("other", b"a,b\n", "x.csv")]))
+    assert part.sink is None
+
+
+def test_truncated_body_fails_finalize():
+    raw = body([("file", b"a,b\n1,2\n", "x.csv")])
+    for end in (10, raw.index(b"a,b"), len(raw) - 4):
+        with pytest.raises(InvalidUpload):
+            parse(raw[:end])
+
+
+def test_junk_after_boundary_is_rejected():
+    raw = body([("file", b"a\n", "x.csv")]).replace(BOUNDARY + b"\r\n", BOUNDARY + b"junk\r\n", 1)
+    with pytest.raises(InvalidUpload):
+        parse(raw)
+
+
+def test_matches_python_multipart_on_random_splits():
+    rng = random.Random(15)
+    for _ in range(200):
+        data = bytes(rng.choice(b"ab,\r\n-") for _ in range(rng.randrange(400)))
+        if rng.random() < 0.5:
+            data += b"\r\n--" + BOUNDARY[:rng.randrange(len(BOUNDARY))]
+        parts = [("file", data, "x.csv")]
+        if rng.random() < 0.5:
+            parts.insert(0, ("notes", bytes(rng.choice(b"xy\r\n-") for _ in range(rng.randrange(50))), None))
+        raw  = body(parts)
+        cuts = rng.sample(range(1, len(raw)), k=min(rng.randrange(8), len(raw) - 1))
+        _, sink = parse(raw, cuts)
+        assert bytes(sink.data) == data == python_multipart_file(raw, cuts)
+
+
+# ── receive_file ──────────────────────────────────────────────────────────────
+
+def request(raw: bytes, chunk: int = 64) -> Request:
+    messages = [{"type": "http.request", "body": raw[i:i + chunk], "more_body": i + chunk < len(raw)}
+                for i in range(0, len(raw), chunk)] or [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        return messages.pop(0)
+    content_type = b"multipart/form-data; boundary=" + BOUNDARY
+    return Request({"type": "http", "method": "POST", "headers": [(b"content-type", content_type)]}, receive)
+
+
+def test_receive_file_streams_into_the_sink():
+    data = b"decision\napproved\n" * 100
+    sink = Collect()
+    filename, got = asyncio.run(receive_file(request(body([("file", data, "x.csv")])), "file", lambda name: sink))
+    assert (filename, got) == ("x.csv", sink)
+    assert bytes(sink.data) == data and not sink.aborted
+
+
+def test_receive_file_without_the_field_is_invalid():
+    with pytest.raises(InvalidUpload, match="No file"):
+        asyncio.run(receive_file(request(body([("other", b"a\n", "x.csv")])), "file", lambda name: Collect()))
+
+
+def test_sink_is_aborted_on_a_truncated_body():
+    sink = Collect()
+    raw  = body([("file", b"decision\napproved\n" * 100, "x.csv")])
+    with pytest.raises(InvalidUpload):
+        asyncio.run(receive_file(request(raw[:-30]), "file", lambda name: sink))
+    assert sink.aborted
+
+
+def test_sink_is_aborted_when_writing_fails():
+    class Full(Collect):
+        def write(self, chunk: bytes) -> None:
+            raise OSError("No space left on device")
+    sink = Full()
+    with pytest.raises(OSError):
+        asyncio.run(receive_file(request(body([("file", b"decision\napproved\n", "x.csv")])), "file", lambda name: sink))
+    assert sink.aborted
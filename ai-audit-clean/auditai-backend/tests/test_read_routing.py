@@ -0,0 +1,161 @@
+"""
+Read routing with two SQLite files: the test database as the primary and a
+snapshot of it, taken when the test says, as a lagging replica.
+"""
+import sqlite3
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core import read_routing
+from app.core.database import DATABASE_URL, AsyncSessionLocal, make_engine
+from app.core.read_routing import PRIMARY_UNTIL_HEADER, ReadYourWritesMiddleware, acting_for, acting_user
+from app.main import app
+from app.models.orm import User
+from tests.conftest import WORKDIR, client, register, run
+
+PRIMARY = DATABASE_URL.split(":///", 1)[1]
+REPLICA = f"{WORKDIR}/replica.db"
+MANUAL  = {
+    "model_name": "routed", "bias_score": 40, "hallucination_score": 20, "toxicity_score": 10,
+    "robustness_score": 70, "explainability_score": 60,
+}
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Turn on the replica for one test; returns a function that brings it up to date."""
+    replica_engine = make_engine(f"sqlite+aiosqlite:///{REPLICA}")
+    monkeypatch.setattr(read_routing, "read_engine", replica_engine)
+    monkeypatch.setattr(read_routing, "ReadSessionLocal", async_sessionmaker(replica_engine, expire_on_commit=False))
+    listeners = [("after_flush", read_routing._after_flush), ("after_commit", read_routing._after_commit),
+                 ("after_rollback", read_routing._after_rollback)]
+    for name, fn in listeners:
+        event.listen(Session, name, fn)
+    read_routing._primary_until.clear()
+
+    async def catch_up():
+        await replica_engine.dispose()
+        source, target = sqlite3.connect(PRIMARY), sqlite3.connect(REPLICA)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+    run(catch_up())
+    yield catch_up
+    for name, fn in listeners:
+        event.remove(Session, name, fn)
+    read_routing._primary_until.clear()
+    run(replica_engine.dispose())
+
+
+def routed_client():
+    return client(ReadYourWritesMiddleware(app))
+
+
+def counts() -> dict:
+    stats = read_routing.read_routing_stats()
+    return {key: stats[key] for key in ("replica", "primary", "primary_on_miss")}
+
+
+def moved(before: dict) -> dict:
+    return {key: value - before[key] for key, value in counts().items() if value != before[key]}
+
+
+def test_reads_right_after_a_write_go_to_the_primary(replica):
+    async def scenario():
+        async with routed_client() as http:
+            headers = await register(http, "sticky@example.com")
+            created = await http.post("/reports/generate", json=MANUAL, headers=headers)
+            assert created.status_code == 200
+            assert float(created.headers[PRIMARY_UNTIL_HEADER]) > 0
+            report_id = created.json()["id"]
+
+            before = counts()
+            listed = await http.get("/reports/", headers=headers)
+            assert [r["id"] for r in listed.json()] == [report_id]
+            assert moved(before) == {"primary": 1}
+
+            # Another process: no sticky entry here, only the client's header
+            read_routing._primary_until.clear()
+            before = counts()
+            listed = await http.get("/reports/", headers={**headers, PRIMARY_UNTIL_HEADER: created.headers[PRIMARY_UNTIL_HEADER]})
+            assert [r["id"] for r in listed.json()] == [report_id]
+            assert moved(before) == {"primary": 1}
+
+            # Once the window has passed, reads go to the replica, which hasn't caught up yet
+            before = counts()
+            assert (await http.get("/reports/", headers=headers)).json() == []
+            assert moved(before) == {"replica": 1}
+
+            await replica()
+            assert [r["id"] for r in (await http.get("/reports/", headers=headers)).json()] == [report_id]
+    run(scenario())
+
+
+def test_a_made_up_header_cannot_pin_reads_to_the_primary(replica):
+    async def scenario():
+        async with routed_client() as http:
+            headers = await register(http, "pinned@example.com")
+            before  = counts()
+            await http.get("/reports/", headers={**headers, PRIMARY_UNTIL_HEADER: "99999999999"})
+            await http.get("/reports/", headers={**headers, PRIMARY_UNTIL_HEADER: "soon"})
+            assert moved(before) == {"replica": 2}
+    run(scenario())
+
+
+def test_a_report_missing_on_the_replica_is_found_on_the_primary(replica):
+    async def scenario():
+        async with routed_client() as http:
+            headers   = await register(http, "miss@example.com")
+            report_id = (await http.post("/reports/generate", json=MANUAL, headers=headers)).json()["id"]
+            read_routing._primary_until.clear()
+
+            before = counts()
+            fetched = await http.get(f"/reports/{report_id}", headers=headers)
+            assert fetched.status_code == 200 and fetched.json()["id"] == report_id
+            assert moved(before) == {"replica": 1, "primary_on_miss": 1}
+
+            before = counts()
+            assert (await http.get("/reports/no-such-report", headers=headers)).status_code == 404
+            assert moved(before) == {"replica": 1, "primary_on_miss": 1}
+    run(scenario())
+
+
+def test_commits_in_the_users_context_make_them_sticky(replica):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            with acting_for("reader"):
+                await db.execute(select(User).limit(1))
+                await db.commit()   # wrote nothing
+            assert not read_routing.reads_from_primary("reader")
+
+            with acting_for("writer"):
+                db.add(User(email="writer@example.com", hashed_password="x"))
+                await db.commit()
+            assert read_routing.reads_from_primary("writer")
+
+            db.add(User(email="nobody@example.com", hashed_password="x"))
+            await db.commit()   # no acting user; nobody to make sticky
+        assert set(read_routing._primary_until) == {"writer"}
+    run(scenario())
+
+
+def test_acting_user_is_reset_after_each_request(replica):
+    async def scenario():
+        async with routed_client() as http:
+            headers = await register(http, "reset@example.com")
+            await http.post("/reports/generate", json=MANUAL, headers=headers)
+            assert acting_user.get() is None
+            await http.post("/reports/generate", json={}, headers=headers)   # fails validation
+            assert acting_user.get() is None
+
+        with pytest.raises(RuntimeError):
+            with acting_for("someone"):
+                raise RuntimeError
+        assert acting_user.get() is None
+    run(scenario())
@@ -0,0 +1,110 @@
+"""ReportJobRunner: claiming, sweeping up after dead processes, and the jobs endpoints."""
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.orm import ReportJob, User
+from app.models.schemas import ReportRequest
+from app.services.report_jobs import ReportJobRunner, get_report_job_runner
+from tests.conftest import client, register, run
+
+MANUAL = {
+    "model_name": "credit-scorer", "org_name": "Acme", "use_case": "lending",
+    "bias_score": 40, "hallucination_score": 20, "toxicity_score": 10,
+    "robustness_score": 70, "explainability_score": 60,
+}
+
+
+async def make_user(email: str) -> str:
+    async with AsyncSessionLocal() as db:
+        user = User(email=email, hashed_password="x")
+        db.add(user)
+        await db.commit()
+        return user.id
+
+
+async def add_job(user_id: str, **values) -> str:
+    async with AsyncSessionLocal() as db:
+        job = ReportJob(user_id=user_id, request=ReportRequest(**MANUAL).model_dump(), **values)
+        db.add(job)
+        await db.commit()
+        return job.id
+
+
+async def get_job(job_id: str) -> ReportJob:
+    async with AsyncSessionLocal() as db:
+        return await db.get(ReportJob, job_id)
+
+
+def test_two_runners_cannot_both_claim_a_job(monkeypatch):
+    generated = []
+
+    async def generate(self, db, job, run):
+        generated.append(run)
+        await asyncio.sleep(0.05)
+        await self._set(run, status="succeeded", finished_at=datetime.utcnow())
+    monkeypatch.setattr(ReportJobRunner, "_generate", generate)
+
+    async def scenario():
+        job_id = await add_job(await make_user("claim@example.com"))
+        first, second = ReportJobRunner(workers=0), ReportJobRunner(workers=0)
+        await asyncio.gather(first._run(job_id), second._run(job_id), first._run(job_id))
+        job = await get_job(job_id)
+        assert generated == [(job_id, 1)]
+        assert (job.status, job.attempts) == ("succeeded", 1)
+    run(scenario())
+
+
+def test_sweep_requeues_or_fails_jobs_with_a_stale_heartbeat():
+    async def scenario():
+        user_id  = await make_user("sweep@example.com")
+        stale    = datetime.utcnow() - timedelta(seconds=3 * settings.REPORT_JOB_SWEEP_S)
+        dead     = await add_job(user_id, status="running", stage="scoring", attempts=1, heartbeat_at=stale)
+        given_up = await add_job(user_id, status="running", attempts=settings.REPORT_JOB_MAX_ATTEMPTS, heartbeat_at=stale)
+        alive    = await add_job(user_id, status="running", attempts=1, heartbeat_at=datetime.utcnow())
+
+        runner = ReportJobRunner(workers=0)
+        runner.start()
+        try:
+            await runner.sweep()
+            dead_job, given_up_job, alive_job = [await get_job(i) for i in (dead, given_up, alive)]
+            assert (dead_job.status, dead_job.stage) == ("queued", None)
+            assert dead in runner._queued
+            assert given_up_job.status == "failed"
+            assert "Interrupted" in given_up_job.error
+            assert alive_job.status == "running" and alive not in runner._queued
+        finally:
+            await runner.shutdown()
+    run(scenario())
+
+
+def test_jobs_endpoints_report_status_and_result():
+    async def scenario():
+        runner = get_report_job_runner()
+        runner.start()
+        try:
+            async with client() as http:
+                headers  = await register(http, "jobs@example.com")
+                response = await http.post("/reports/generate?mode=job", json=MANUAL, headers=headers)
+                assert response.status_code == 202
+                job_id = response.json()["id"]
+                assert response.json()["status"] == "queued"
+
+                events = await http.get(f"/reports/jobs/{job_id}/events", headers=headers)
+                statuses = [json.loads(line[len("data: "):])
+                            for line in events.text.splitlines() if line.startswith("data: ")]
+                assert statuses[-1]["status"] == "succeeded"
+
+                job = (await http.get(f"/reports/jobs/{job_id}", headers=headers)).json()
+                assert job["status"] == "succeeded" and job["attempts"] == 1 and job["report_id"]
+                report = await http.get(f"/reports/{job['report_id']}", headers=headers)
+                assert report.status_code == 200
+                assert report.json()["model_name"] == "credit-scorer"
+
+                other = await register(http, "not-the-owner@example.com")
+                assert (await http.get(f"/reports/jobs/{job_id}", headers=other)).status_code == 404
+        finally:
+            await runner.shutdown()
+    run(scenario())
@@ -0,0 +1,62 @@
+"""GET /reports/ pages: keyset cursors over (created_at, id), including ties on created_at."""
+import base64
+from datetime import datetime, timedelta
+
+from app.core.database import AsyncSessionLocal
+from app.core.security import decode_token
+from app.models.orm import Report
+from tests.conftest import client, register, run
+
+
+async def add_reports(user_id: str, created: list[datetime]) -> set[str]:
+    async with AsyncSessionLocal() as db:
+        reports = [
+            Report(user_id=user_id, model_name=f"m{i}", overall_risk="LOW", readiness_pct=90, created_at=at)
+            for i, at in enumerate(created)
+        ]
+        db.add_all(reports)
+        await db.commit()
+        return {report.id for report in reports}
+
+
+async def all_pages(http, headers: dict, limit: int) -> list[dict]:
+    rows, params = [], {"limit": limit}
+    while True:
+        response = await http.get("/reports/", params=params, headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()) <= limit
+        rows += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows
+        params = {"limit": limit, "cursor": cursor}
+
+
+def test_pages_have_no_duplicates_or_gaps_across_equal_timestamps():
+    async def scenario():
+        async with client() as http:
+            headers = await register(http, "pages@example.com")
+            user_id = decode_token(headers["Authorization"].split()[1])["sub"]
+            t0      = datetime(2026, 1, 1, 12)
+            # Runs of reports sharing a created_at, longer than a page, on both sides of page breaks
+            created = [t0] * 7 + [t0 - timedelta(seconds=1)] * 3 + [t0 - timedelta(minutes=5)] + [t0 + timedelta(hours=1)] * 4
+            ids     = await add_reports(user_id, created)
+
+            for limit in (1, 2, 3, 5, 15, 200):
+                rows = await all_pages(http, headers, limit)
+                keys = [(row["created_at"], row["id"]) for row in rows]
+                assert len(keys) == len(set(keys)) == len(ids), limit
+                assert {row["id"] for row in rows} == ids
+                assert keys == sorted(keys, reverse=True)   # newest first, then id descending
+    run(scenario())
+
+
+def test_invalid_cursor_is_400():
+    async def scenario():
+        async with client() as http:
+            headers = await register(http, "cursor@example.com")
+            for cursor in ("not-a-cursor", base64.urlsafe_b64encode(b"yesterday|abc").decode(), "%%%"):
+                response = await http.get("/reports/", params={"cursor": cursor}, headers=headers)
+                assert response.status_code == 400, cursor
+            assert (await http.get("/reports/", params={"limit": 0}, headers=headers)).status_code == 422
+    run(scenario())
@@ -0,0 +1,94 @@
+"""
+Streamed scoring must give compute_all_scores' result for the whole file,
+apart from drift (see DriftAccumulator), however small the chunks.
+"""
+import json
+import random
+
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.services.ingest import score_source
+from app.services.scoring import compute_all_scores
+
+CHUNK_ROWS = 7
+ROWS       = 3000
+EXACT      = ["bias", "hallucination", "toxicity", "robustness", "explainability", "data_leakage"]
+
+
+def make_rows(seed: int = 7) -> list[dict]:
+    """
+    Labels spelled several ways ("1", "1.0", 1), some CHUNK_ROWS blocks with
+    only "1" or blank decisions, numeric prompts (float in a whole-file
+    parse, for the blanks) of which the first 15 always get "1", and ages
+    with strings among them.
+    """
+    rng  = random.Random(seed)
+    rows = []
+    while len(rows) < ROWS:
+        only_ones = rng.random() < 0.2
+        for _ in range(CHUNK_ROWS):
+            prompt = rng.randrange(60)
+            if prompt < 15:
+                decision = "1"
+            elif only_ones:
+                decision = rng.choice(["1", ""])
+            else:
+                decision = rng.choice(["approved", "denied", "1", "1.0"])
+            rows.append({
+                "decision":     decision,
+                "ground_truth": rng.choice(["1", "0", "approved", "denied"]),
+                "gender":       rng.choice(["M", "F", "1"]),
+                "age":          rng.choice(["34", "70", "", "19", "unknown"]),
+                "prompt":       str(prompt) if rng.random() > 0.05 else "",
+                "confidence":   round(rng.random(), 3),
+            })
+    return rows[:ROWS]
+
+
+@pytest.fixture
+def streamed(monkeypatch):
+    monkeypatch.setattr(settings, "SCORING_STREAM_THRESHOLD_MB", 0)
+    monkeypatch.setattr(settings, "SCORING_CHUNK_ROWS", CHUNK_ROWS)
+
+    def score(path: str, ext: str) -> dict:
+        with open(path, "rb") as f:
+            return score_source(f, ext, size_bytes=1)["scores"]
+    return score
+
+
+def assert_same_scores(streamed: dict, whole: dict) -> None:
+    for metric in EXACT:
+        assert streamed[metric] == pytest.approx(whole[metric], abs=1e-9), metric
+
+
+def test_csv_chunks_match_whole_file(tmp_path, streamed):
+    path = tmp_path / "outputs.csv"
+    pd.DataFrame(make_rows()).to_csv(path, index=False)
+
+    assert_same_scores(streamed(str(path), "csv"), compute_all_scores(pd.read_csv(path)))
+
+
+def test_ndjson_batches_match_whole_file(tmp_path, streamed):
+    rows = make_rows(seed=11)
+    for i, row in enumerate(rows):
+        if row["decision"] == "1" and i % 2:
+            row["decision"] = 1   # the same label as a JSON number
+    path = tmp_path / "outputs.ndjson"
+    path.write_text("".join(json.dumps({k: v for k, v in row.items() if v != ""}) + "\n" for row in rows))
+    whole = pd.DataFrame([json.loads(line) for line in path.read_text().splitlines()])
+
+    assert_same_scores(streamed(str(path), "ndjson"), compute_all_scores(whole))
+
+
+def test_ndjson_key_first_seen_in_a_later_batch(tmp_path, streamed):
+    rows = [{"decision": "approved", "gender": "M"}] * CHUNK_ROWS + [{"decision": "denied", "gender": "F", "note": "x"}]
+    path = tmp_path / "outputs.ndjson"
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    assert streamed(str(path), "ndjson")   # an unscored key is ignored
+
+    rows.append({"decision": "denied", "gender": "F", "ground_truth": "approved"})
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    with pytest.raises(ValueError, match=f"Line {len(rows)} adds column 'ground_truth'"):
+        streamed(str(path), "ndjson")
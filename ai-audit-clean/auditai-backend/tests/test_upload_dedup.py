@@ -0,0 +1,114 @@
+"""Content-addressed uploads: one blob per (hash, ext), shared scores, and what is kept on failure."""
+import os
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.core.database import AsyncSessionLocal
+from app.core.security import decode_token
+from app.models.orm import Blob, Upload
+from app.routers.upload import _discard, _save_upload_record
+from app.services.executor import get_scoring_executor
+from app.services.storage import BlobWriter
+from tests.conftest import client, register, run
+
+CSV = b"decision,ground_truth,gender\napproved,approved,M\ndenied,approved,F\napproved,denied,F\n"
+
+
+def user_id(headers: dict) -> str:
+    return decode_token(headers["Authorization"].split()[1])["sub"]
+
+
+def store(content: bytes, ext: str = ".csv"):
+    writer = BlobWriter(ext)
+    writer.write(content)
+    return writer.close()
+
+
+async def count_blobs(content_hash: str) -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(Blob).where(Blob.content_hash == content_hash))
+
+
+async def count_uploads(content_hash: str) -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(
+            select(func.count()).select_from(Upload).join(Blob).where(Blob.content_hash == content_hash)
+        )
+
+
+def test_same_content_reuses_the_blob_and_its_scores(monkeypatch):
+    async def scenario():
+        async with client() as http:
+            first_user  = await register(http, "first-dedup@example.com")
+            second_user = await register(http, "second-dedup@example.com")
+            first = (await http.post("/upload/", files={"file": ("a.csv", CSV, "text/csv")}, headers=first_user)).json()
+            assert first["cached"] is False
+
+            async def no_scoring(fn, *args, **kwargs):
+                raise AssertionError("cached content was scored again")
+            monkeypatch.setattr(get_scoring_executor(), "run", no_scoring)
+            second = (await http.post("/upload/", files={"file": ("b.csv", CSV, "text/csv")}, headers=second_user)).json()
+            assert second["cached"] is True
+            assert second["content_hash"] == first["content_hash"]
+            assert second["scores"] == first["scores"]
+            assert second["upload_id"] != first["upload_id"]
+            assert await count_blobs(first["content_hash"]) == 1
+            assert await count_uploads(first["content_hash"]) == 2
+            monkeypatch.undo()
+
+            # The extension decides how the bytes parse, so it is part of the blob's identity
+            ndjson = b'{"decision": "approved", "gender": "M"}\n{"decision": "denied", "gender": "F"}\n'
+            for name in ("a.ndjson", "a.jsonl"):
+                response = await http.post("/upload/", files={"file": (name, ndjson, "text/plain")}, headers=first_user)
+                assert response.json()["cached"] is False, name
+            assert await count_blobs(response.json()["content_hash"]) == 2
+    run(scenario())
+
+
+def test_concurrently_created_blob_is_attached_to():
+    async def scenario():
+        async with client() as http:
+            owner = user_id(await register(http, "race@example.com"))
+        content = CSV + b"approved,approved,M\n"
+        stored  = store(content)
+        fields  = dict(content_hash=stored.content_hash, ext="csv", storage_path=stored.storage_path,
+                       row_count=4, scores={"bias": 1.0}, engine_version="x")
+        async with AsyncSessionLocal() as other:   # the upload that won the race
+            winner = Blob(**fields)
+            other.add(winner)
+            await other.commit()
+
+        async with AsyncSessionLocal() as db:
+            upload = await _save_upload_record(db, Blob(**fields), owner, "late.csv")
+            assert upload.blob_id == winner.id
+            assert upload.filename == "late.csv"
+        assert await count_blobs(stored.content_hash) == 1
+    run(scenario())
+
+
+def test_discard_keeps_files_that_a_blob_references():
+    async def scenario():
+        referenced = store(b"decision\n" + os.urandom(8).hex().encode() + b"\n")
+        assert referenced.created
+        async with AsyncSessionLocal() as db:
+            db.add(Blob(content_hash=referenced.content_hash, ext="csv", storage_path=referenced.storage_path))
+            await db.commit()
+            await _discard(db, referenced, "csv", HTTPException(status_code=422))
+            assert os.path.exists(referenced.storage_path)
+
+            transient = store(b"decision\n" + os.urandom(8).hex().encode() + b"\n")
+            await _discard(db, transient, "csv", HTTPException(status_code=503))
+            assert os.path.exists(transient.storage_path)
+
+            unscoreable = store(b"\x00" + os.urandom(8))
+            await _discard(db, unscoreable, "csv", HTTPException(status_code=422))
+            assert not os.path.exists(unscoreable.storage_path)
+
+            again = store(CSV + b"x,y,z\n")
+            second = store(CSV + b"x,y,z\n")   # already stored: this upload isn't its creator
+            assert not second.created and again.created
+            await _discard(db, second, "csv", HTTPException(status_code=422))
+            assert os.path.exists(again.storage_path)
+    run(scenario())
+
@@ -102,13 +102,18 @@ function App({ user, logout }) {
   const [reports, setReports] = useState([]);
   const [section, setSection] = useState(0);
   const [loadingReports, setLoadingReports] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
 
   const loadReports = async () => {
     setLoadingReports(true);
-    try { setReports(await api.listReports()); }
+    try { const {items, nextCursor: next} = await api.listReports(); setReports(items); setNextCursor(next); }
     catch(e) { console.error(e); }
     finally { setLoadingReports(false); }
   };
+  const loadMoreReports = async () => {
+    try { const {items, nextCursor: next} = await api.listReports(nextCursor); setReports(p => [...p, ...items]); setNextCursor(next); }
+    catch(e) { console.error(e); }
+  };
 
   useEffect(() => { loadReports(); }, []);
 
@@ -164,7 +169,7 @@ function App({ user, logout }) {
       <main style={{marginLeft:200,flex:1,padding:32,minHeight:"100vh"}}>
         {page==="new"        && <NewAuditPage onReportReady={r=>{setReport(r);setPage("report");setSection(0);loadReports();}} user={user}/>}
         {page==="report"     && report && <ReportPage report={report} section={section} setSection={setSection}/>}
-        {page==="reports"    && <ReportsPage reports={reports} loading={loadingReports} onOpen={openReport} onDelete={handleDelete}/>}
+        {page==="reports"    && <ReportsPage reports={reports} loading={loadingReports} onOpen={openReport} onDelete={handleDelete} onLoadMore={nextCursor?loadMoreReports:null}/>}
         {page==="frameworks" && <FrameworksPage/>}
       </main>
     </div>
@@ -224,19 +229,14 @@ function NewAuditPage({ onReportReady, user }) {
   const handleGenerate = async () => {
     if (!form.modelName) { setGenError("Model name is required"); return; }
     setGenerating(true); setGenError("");
+    setGenStep("Computing risk scores...");
 
-    const steps = [
-      "Validating inputs...",
-      "Computing risk scores...",
-      "Mapping compliance frameworks...",
-      "Calling Claude AI for analysis...",
-      "Compiling audit report...",
-    ];
-
-    for (const s of steps) {
-      setGenStep(s);
-      await new Promise(r=>setTimeout(r,400));
-    }
+    // Steps follow the server's progress events
+    const steps = {
+      scores:   "Mapping compliance frameworks...",
+      report:   "Calling Claude AI for analysis...",
+      analysis: "Compiling audit report...",
+    };
 
     try {
       const payload = {
@@ -254,7 +254,9 @@ function NewAuditPage({ onReportReady, user }) {
           : manualMetrics
         ),
       };
-      const report = await api.generateReport(payload);
+      const report = await api.generateReportStream(payload, event => {
+        if (steps[event]) setGenStep(steps[event]);
+      });
       onReportReady(report);
     } catch(e) {
       setGenError(e.message);
@@ -359,11 +361,11 @@ function NewAuditPage({ onReportReady, user }) {
                   ) : (
                     <>
                       <div style={{fontSize:24,marginBottom:8}}>⇪</div>
-                      <div style={{fontSize:12,color:"var(--t2)",marginBottom:4}}>Drop your model output CSV or JSON</div>
+                      <div style={{fontSize:12,color:"var(--t2)",marginBottom:4}}>Drop your model output CSV, JSON or NDJSON</div>
                       <div style={{fontSize:10,color:"var(--t3)"}}>Backend computes real bias, toxicity, hallucination scores</div>
                     </>
                   )}
-                  <input ref={fileRef} type="file" accept=".csv,.json" style={{display:"none"}} onChange={e=>handleFile(e.target.files[0])}/>
+                  <input ref={fileRef} type="file" accept=".csv,.json,.ndjson,.jsonl" style={{display:"none"}} onChange={e=>handleFile(e.target.files[0])}/>
                 </div>
 
                 {uploadError && (
@@ -708,8 +710,10 @@ function RecsSection({risks, ai}) {
 }
 
 /* ─── Reports History ────────────────────────────────────────────────────── */
-function ReportsPage({reports, loading, onOpen, onDelete}) {
+function ReportsPage({reports, loading, onOpen, onDelete, onLoadMore}) {
   const [confirm, setConfirm] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const loadMore = async () => { setLoadingMore(true); try { await onLoadMore(); } finally { setLoadingMore(false); } };
   return (
     <div style={{animation:"fadeUp .4s ease",maxWidth:860}}>
       <div style={{marginBottom:28}}>
@@ -750,6 +754,11 @@ function ReportsPage({reports, loading, onOpen, onDelete}) {
               </div>
             </Card>
           ))}
+          {onLoadMore&&(
+            <div style={{display:"flex",justifyContent:"center",marginTop:6}}>
+              <Btn variant="secondary" onClick={loadMore} disabled={loadingMore}>{loadingMore?"Loading…":"Load more"}</Btn>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -4,15 +4,25 @@ function getToken() {
   return localStorage.getItem("auditai_token");
 }
 
+// Set by the backend on responses to our writes, when it reads from a replica;
+// sending it back keeps our reads on the primary until the replica catches up.
+let primaryUntil = null;
+
+function rememberPrimaryUntil(res) {
+  primaryUntil = res.headers.get("X-Primary-Until") || primaryUntil;
+}
+
 function authHeaders() {
   const token = getToken();
   return {
     "Content-Type": "application/json",
     ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    ...(primaryUntil ? { "X-Primary-Until": primaryUntil } : {}),
   };
 }
 
 async function handleResponse(res) {
+  rememberPrimaryUntil(res);
   if (!res.ok) {
     const err = await res.json().catch(() => ({ detail: "Unknown error" }));
     throw new Error(err.detail || `HTTP ${res.status}`);
@@ -58,9 +68,49 @@ export async function generateReport(payload) {
   return handleResponse(res);
 }
 
-export async function listReports() {
-  const res = await fetch(`${BASE}/reports/`, { headers: authHeaders() });
-  return handleResponse(res);
+// Same as generateReport, but over server-sent events: onEvent(name, data) is
+// called for "scores", "report", "analysis_delta" and "analysis" as the report
+// is built, and the saved report from the final "done" event is returned.
+export async function generateReportStream(payload, onEvent = () => {}) {
+  const res = await fetch(`${BASE}/reports/generate/stream`, {
+    method: "POST",
+    headers: authHeaders(),
+    body: JSON.stringify(payload),
+  });
+  if (!res.ok) await handleResponse(res);
+  rememberPrimaryUntil(res);
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    let end;
+    while ((end = buffer.indexOf("\n\n")) >= 0) {
+      const block = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      let event = "message", data = "";
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+      }
+      if (!data) continue;   // keep-alive comment
+      const parsed = JSON.parse(data);
+      if (event === "error") throw new Error(parsed.detail || `HTTP ${parsed.status}`);
+      if (event === "done") return parsed;
+      onEvent(event, parsed);
+    }
+  }
+  throw new Error("Report stream ended before the report was saved");
+}
+
+// One page of reports, newest first; nextCursor is null on the last page.
+export async function listReports(cursor = null) {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+  const res = await fetch(`${BASE}/reports/${query}`, { headers: authHeaders() });
+  const items = await handleResponse(res);
+  return { items, nextCursor: res.headers.get("X-Next-Cursor") };
 }
 
 export async function getReport(id) {